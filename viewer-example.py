@@ -190,6 +190,18 @@ BLP textures are found by searching from the M2 file's directory:
 Run the viewer to see the texture table and what was resolved.
 
 
+Headless Bake
+=============
+
+  python viewer.py --bake [--fps 30] [--out bake] [--workers N] <model.m2> ...
+
+Evaluates every animation at a fixed frame rate without opening a window,
+spreading animations across a process pool, and writes memory-mappable
+caches per model: bake/<Model>/anim_NNN_positions.npy (F, N, 3),
+anim_NNN_bones.npy (F, B, 3, 4) and an index.npz with names, durations
+and frame counts. Prints frames per second per model.
+
+
 Controls
 ========
 
@@ -205,11 +217,14 @@ Keys:
   G                 Toggle selection/edit mode vs camera mode
   Q                 Quit
 
-  Ctrl+S            Save M2
+  Ctrl+S            Save M2 (patches edited vertex records in place when
+                    the file on disk is the one loaded/last saved)
   Ctrl+Shift+S      Save As
 
   A                 Cycle to next animation
   P                 Toggle animation preview (rest pose vs animated)
+  K                 Toggle animation bake cache (sampled clips, LRU)
+  Space             Play/pause animation in real time
   Left/Right        Step animation backward/forward one frame
 
   B                 Toggle bone weight visualization
@@ -217,7 +232,7 @@ Keys:
   W / Shift+W       Increase/decrease bone weight on selected verts
 
   S / Shift+S       Scale selection up/down
-  M                 Mirror selection across Y=0
+  M                 Mirror selection across Y=0 (pairs cached in <model>.m2.mirror.npz)
 
   Ctrl+Z            Undo vertex move (or weight edit in bone mode)
   Ctrl+Shift+Z      Redo vertex move (or weight edit in bone mode)
@@ -225,13 +240,19 @@ Keys:
   Ctrl+Shift+A      Redo selection change
 """
 
+import os
 import sys
-import math
 import time
+import argparse
+import hashlib
+import shutil
+import struct
 import types
+import zipfile
 import tkinter as tk
 from tkinter import filedialog
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import importlib.util
 
@@ -273,7 +294,6 @@ m2_format = _import_wt('m2_format')
 load_m2 = m2_format.load_m2
 save_m2 = m2_format.save_m2
 M2File = m2_format.M2File
-M2Track = m2_format.M2Track
 GEOSET_NAMES = m2_format.GEOSET_NAMES
 TEX_TYPE_NAMES = m2_format.TEX_TYPE_NAMES
 
@@ -287,139 +307,480 @@ decode_blp = blp_decode.decode_blp
 # Animation evaluation helpers
 # ---------------------------------------------------------------------------
 
-def _lerp(a, b, t):
-    """Linear interpolation between tuples a and b."""
-    return tuple(a[i] + (b[i] - a[i]) * t for i in range(len(a)))
+CLIP_CACHE_BYTES = 256 * 1024 * 1024  # memory budget for baked animation clips
+
 
+class SkinningEngine:
+    """Linear-blend skinning over packed per-vertex arrays.
 
-def _quat_dot(a, b):
-    return sum(a[i] * b[i] for i in range(4))
+    Positions, bone indices and weights are packed into contiguous arrays
+    once per model. deform() then blends the four bone matrices of every
+    vertex and transforms all positions in one batched operation.
 
+    Bone slots that reference a bone past the end of the skeleton contribute
+    nothing, matching the per-vertex loop this replaces.
+    """
+
+    def __init__(self, positions, bone_indices, bone_weights, n_bones):
+        self.positions = positions  # (N, 3); may alias the caller's buffer
+        self.n_bones = n_bones
+        self.bone_indices = np.zeros((len(positions), 4), dtype=np.intp)
+        self.weights = np.zeros((len(positions), 4), dtype=np.float64)
+        self.set_weights(np.arange(len(positions)), bone_indices, bone_weights)
+
+    @classmethod
+    def from_m2(cls, m2: M2File, positions=None):
+        """Pack an M2's vertices. `positions` overrides the rest positions."""
+        if positions is None:
+            positions = np.array([v.pos for v in m2.vertices], dtype=np.float64)
+        bone_indices = np.array([v.bone_indices for v in m2.vertices],
+                                dtype=np.intp).reshape(-1, 4)
+        bone_weights = np.array([v.bone_weights for v in m2.vertices],
+                                dtype=np.float64).reshape(-1, 4)
+        return cls(positions, bone_indices, bone_weights, len(m2.bones))
+
+    def set_weights(self, indices, bone_indices, bone_weights):
+        """Replace the bone slots of the given vertices (weights in 0..255)."""
+        bone_indices = np.asarray(bone_indices, dtype=np.intp)
+        # Out-of-range slots point at the trailing zero matrix in deform()
+        self.bone_indices[indices] = np.where(bone_indices < self.n_bones,
+                                              bone_indices, self.n_bones)
+        self.weights[indices] = np.asarray(bone_weights, dtype=np.float64) / 255.0
+
+    def deform(self, bone_matrices, indices=None) -> np.ndarray:
+        """Return float64 positions skinned by (B, 4, 4) bone matrices.
+
+        With `indices`, only those vertices are skinned and the result is
+        (len(indices), 3); otherwise all vertices, (N, 3).
+        """
+        mats = np.zeros((self.n_bones + 1, 3, 4), dtype=np.float64)
+        if self.n_bones:
+            mats[:self.n_bones] = np.asarray(bone_matrices)[:, :3, :]
+        if indices is None:
+            weights, bone_indices, pos = self.weights, self.bone_indices, self.positions
+        else:
+            weights = self.weights[indices]
+            bone_indices = self.bone_indices[indices]
+            pos = self.positions[indices]
+        blend = np.einsum('nk,nkij->nij', weights, mats[bone_indices])
+        pos = np.asarray(pos, dtype=np.float64)
+        return np.einsum('nij,nj->ni', blend[:, :, :3], pos) + blend[:, :, 3]
+
+
+class CompiledTrack:
+    """One keyframe channel of every bone, compiled into NumPy arrays.
+
+    Built once at load. For each animation, the keyframes of all bones that
+    have any are packed back to back: local times (relative to the first key
+    of the range) and values. Each bone's segment is shifted by a multiple of
+    a span larger than any local time, so a single np.searchsorted finds the
+    keyframe pair of every bone at every requested time.
+
+    sample() follows the M2 track rules: times before the first key or
+    after the last clamp to the end values, interp_type 0 steps, and linear
+    tracks lerp (nlerp for quaternions).
+    """
 
-def _nlerp(a, b, t):
-    """Normalized linear interpolation for quaternions (x, y, z, w)."""
-    if _quat_dot(a, b) < 0:
-        b = tuple(-b[i] for i in range(4))
-    q = _lerp(a, b, t)
-    length = math.sqrt(sum(c * c for c in q))
-    if length < 1e-10:
-        return (0.0, 0.0, 0.0, 1.0)
-    return tuple(c / length for c in q)
+    def __init__(self, tracks, is_quat=False):
+        self.is_quat = is_quat
+        self.dim = 4 if is_quat else 3
+        n_anims = max((len(t.ranges) for t in tracks if t.values), default=0)
+        self._anims = [self._compile(tracks, a) for a in range(n_anims)]
+
+    def _compile(self, tracks, anim_index):
+        ids, times, values, counts, linear = [], [], [], [], []
+        for bi, track in enumerate(tracks):
+            if not track.values or anim_index >= len(track.ranges):
+                continue
+            start, end = track.ranges[anim_index]
+            if start >= end or start >= len(track.timestamps):
+                continue
+            end = min(end, len(track.timestamps))
+            ts = np.asarray(track.timestamps[start:end], dtype=np.float64)
+            ids.append(bi)
+            times.append(ts - ts[0])
+            values.append(np.asarray(track.values[start:end],
+                                     dtype=np.float64).reshape(-1, self.dim))
+            counts.append(end - start)
+            linear.append(track.interp_type != 0)
+        if not ids:
+            return None
+        counts = np.array(counts, dtype=np.intp)
+        first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        times = np.concatenate(times)
+        values = np.concatenate(values)
+        last = first + counts - 1
+        span = float(times.max()) + 1.0
+        seg = np.repeat(np.arange(len(ids)), counts)
+        same_as_first = np.all(values == values[first[seg]], axis=1)
+        return {
+            'ids': np.array(ids, dtype=np.intp),
+            'times': times,
+            'values': values,
+            'constant': np.logical_and.reduceat(same_as_first, first),
+            'keys': times + seg * span,
+            'span': span,
+            'first': first,
+            'last': last,
+            'last_time': times[last],
+            'linear': np.array(linear, dtype=bool),
+        }
+
+    def _packed(self, anim_index):
+        if 0 <= anim_index < len(self._anims):
+            return self._anims[anim_index]
+        return None
+
+    def classify(self, anim_index):
+        """Split the bones keyed in an animation into constant and animated.
+
+        Returns (bone_ids, constant, first_values): a channel is constant
+        when every keyframe in its range holds the same value (including a
+        single keyframe), in which case first_values is its value. Bones not
+        in bone_ids have no keyframes (the channel is absent).
+        """
+        packed = self._packed(anim_index)
+        if packed is None:
+            return (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=bool),
+                    np.zeros((0, self.dim), dtype=np.float64))
+        return (packed['ids'], packed['constant'],
+                packed['values'][packed['first']])
+
+    def sample(self, anim_index, time_ms, rows=None):
+        """Sample every keyed bone at `time_ms` (scalar or array of times).
+
+        Returns (bone_ids, values) where values has shape (K, dim) for a
+        scalar time or (T, K, dim) for T times. Bones without keyframes in
+        this animation are omitted. `rows` restricts sampling to a subset of
+        the keyed bones, given as positions in the bone_ids of classify().
+        """
+        lead = np.shape(time_ms)
+        packed = self._packed(anim_index)
+        if packed is None:
+            return (np.zeros(0, dtype=np.intp),
+                    np.zeros(lead + (0, self.dim), dtype=np.float64))
+        if rows is None:
+            rows = np.arange(len(packed['ids']))
+        first = packed['first'][rows]
+        last = packed['last'][rows]
+        last_time = packed['last_time'][rows]
+        t = np.asarray(time_ms, dtype=np.float64)[..., None]
+        t_clamped = np.minimum(np.maximum(t, 0.0), last_time)
+        seg_base = rows * packed['span']
+        lo = np.searchsorted(packed['keys'], seg_base + t_clamped, side='right') - 1
+        lo = np.where(t <= 0, first, lo)
+        hi = np.minimum(lo + 1, last)
+        times = packed['times']
+        vals = packed['values']
+        a = vals[lo]
+        ids = packed['ids'][rows]
+        blend = packed['linear'][rows] & (t > 0) & (t < last_time)
+        if not blend.any():
+            return ids, a
+        dt = times[hi] - times[lo]
+        safe_dt = np.where(dt > 0, dt, 1.0)
+        frac = np.where(blend & (dt > 0), (t - times[lo]) / safe_dt, 0.0)
+        b = vals[hi]
+        if self.is_quat:
+            b = np.where((a * b).sum(axis=-1, keepdims=True) < 0, -b, b)
+            q = a + (b - a) * frac[..., None]
+            length = np.sqrt((q * q).sum(axis=-1, keepdims=True))
+            q = np.where(length < 1e-10, np.array([0.0, 0.0, 0.0, 1.0]),
+                         q / np.where(length < 1e-10, 1.0, length))
+        else:
+            q = a + (b - a) * frac[..., None]
+        return ids, np.where(blend[..., None], q, a)
 
 
-def _quat_to_matrix(q):
-    """Convert quaternion (x, y, z, w) to 3x3 rotation matrix."""
-    x, y, z, w = q
+class CompiledBoneTracks:
+    """Compiled translation, rotation and scale channels of a skeleton."""
+
+    def __init__(self, bones):
+        self.translation = CompiledTrack([b.translation for b in bones])
+        self.rotation = CompiledTrack([b.rotation for b in bones], is_quat=True)
+        self.scale = CompiledTrack([b.scale for b in bones])
+
+
+def _quats_to_matrices(q):
+    """Convert (N, 4) quaternions (x, y, z, w) to (N, 3, 3) rotation matrices."""
+    x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
     xx, yy, zz = x*x, y*y, z*z
     xy, xz, yz = x*y, x*z, y*z
     wx, wy, wz = w*x, w*y, w*z
-    return np.array([
-        [1 - 2*(yy+zz),     2*(xy-wz),     2*(xz+wy)],
-        [    2*(xy+wz), 1 - 2*(xx+zz),     2*(yz-wx)],
-        [    2*(xz-wy),     2*(yz+wx), 1 - 2*(xx+yy)],
-    ], dtype=np.float64)
+    m = np.empty((len(q), 3, 3), dtype=np.float64)
+    m[:, 0, 0] = 1 - 2*(yy+zz); m[:, 0, 1] = 2*(xy-wz);     m[:, 0, 2] = 2*(xz+wy)
+    m[:, 1, 0] = 2*(xy+wz);     m[:, 1, 1] = 1 - 2*(xx+zz); m[:, 1, 2] = 2*(yz-wx)
+    m[:, 2, 0] = 2*(xz-wy);     m[:, 2, 1] = 2*(yz+wx);     m[:, 2, 2] = 1 - 2*(xx+yy)
+    return m
+
+
+class BonePoseEvaluator:
+    """Batched evaluation of the bone hierarchy for one M2 skeleton.
+
+    The parent chain is flattened once into depth levels (every parent sits
+    in an earlier level than its children). A pose is then built as one
+    stacked (B, 4, 4) array of local TRS matrices, and world matrices are
+    resolved one level at a time with a batched matmul.
+
+    Per animation, a plan classifies each bone's channels as absent,
+    constant or animated (see CompiledTrack.classify). Local matrices of
+    bones with no animated channel are cached, as are world matrices of
+    bones whose whole ancestor chain is static, so per-frame work only
+    touches animated bones and their descendants.
+    """
 
+    def __init__(self, bones):
+        self.bones = bones
+        self.tracks = CompiledBoneTracks(bones)
+        n = len(bones)
+        self.parents = np.array([b.parent for b in bones], dtype=np.intp).reshape(n)
+        self.pivots = np.array([b.pivot for b in bones], dtype=np.float64).reshape(n, 3)
+
+        # Parents outside the skeleton are treated as roots
+        self.parents[(self.parents < 0) | (self.parents >= n)] = -1
+        depth = np.full(n, -1, dtype=np.intp)
+        for bi in range(n):
+            chain = []
+            b = bi
+            while b >= 0 and depth[b] < 0 and len(chain) <= n:
+                chain.append(b)
+                b = self.parents[b]
+            d = depth[b] if b >= 0 else -1
+            for c in reversed(chain):
+                d += 1
+                depth[c] = d
+        self.depth = depth
+        self.levels = [np.flatnonzero(depth == d)
+                       for d in range(int(depth.max()) + 1 if n else 0)]
+        self._plans = {}  # anim_index -> static/animated analysis
+
+    def _channels(self):
+        return (self.tracks.translation, self.tracks.rotation, self.tracks.scale)
+
+    def plan(self, anim_index):
+        """Return the cached static-track analysis of one animation."""
+        plan = self._plans.get(anim_index)
+        if plan is not None:
+            return plan
+        n = len(self.bones)
+        rest = [np.zeros((n, 3)), np.tile([0.0, 0.0, 0.0, 1.0], (n, 1)),
+                np.ones((n, 3))]
+        animated = np.zeros(n, dtype=bool)
+        keyed_rows = []
+        for channel, values in zip(self._channels(), rest):
+            ids, constant, first_values = channel.classify(anim_index)
+            values[ids[constant]] = first_values[constant]
+            animated[ids[~constant]] = True
+            rows = np.flatnonzero(~constant)
+            keyed_rows.append((rows, ids[rows]))
+
+        static_world = ~animated
+        for level in self.levels[1:]:
+            static_world[level] &= static_world[self.parents[level]]
+
+        local = self.compose_locals(*rest)
+        anim_bones = np.flatnonzero(animated)
+        plan = {
+            'local': local,
+            'world': self.resolve_world(local),
+            'rest': rest,
+            'anim_bones': anim_bones,
+            # animated rows per channel, and where those bones sit in anim_bones
+            'rows': [(rows, np.searchsorted(anim_bones, ids))
+                     for rows, ids in keyed_rows],
+            'dynamic_levels': [level[~static_world[level]]
+                               for level in self.levels],
+        }
+        self._plans[anim_index] = plan
+        return plan
+
+    def local_matrices(self, anim_index, time_ms):
+        """Build local matrices T(p) * T(t) * R * S * T(-p) for every bone.
+
+        `time_ms` may be a scalar, giving (B, 4, 4), or an array of times,
+        giving (T, B, 4, 4). Only animated bones are recomputed; the rest
+        come from the animation's cached plan.
+        """
+        plan = self.plan(anim_index)
+        lead = np.shape(time_ms)
+        local = np.empty(lead + plan['local'].shape, dtype=np.float64)
+        local[...] = plan['local']
+        bones = plan['anim_bones']
+        if not len(bones):
+            return local
+        channels = []
+        for rest, channel, (rows, slots) in zip(plan['rest'], self._channels(),
+                                                plan['rows']):
+            out = np.empty(lead + (len(bones), rest.shape[1]), dtype=np.float64)
+            out[...] = rest[bones]
+            if len(rows):
+                _, values = channel.sample(anim_index, time_ms, rows)
+                out[..., slots, :] = values
+            channels.append(out)
+        local[..., bones, :, :] = self.compose_locals(*channels,
+                                                      pivots=self.pivots[bones])
+        return local
+
+    def compose_locals(self, trans, quats, scale, pivots=None):
+        """Stack local matrices from (..., B, 3) translation, (..., B, 4)
+        rotation and (..., B, 3) scale arrays."""
+        if pivots is None:
+            pivots = self.pivots
+        lead = quats.shape[:-1]
+        rs = (_quats_to_matrices(quats.reshape(-1, 4)).reshape(lead + (3, 3))
+              * scale[..., None, :])
+        local = np.zeros(lead + (4, 4), dtype=np.float64)
+        local[..., :3, :3] = rs
+        local[..., :3, 3] = (pivots + trans
+                             - np.einsum('...ij,...j->...i', rs, pivots))
+        local[..., 3, 3] = 1.0
+        return local
+
+    def resolve_world(self, local):
+        """Resolve world matrices from local ones, parents before children."""
+        world = local.copy()
+        for level in self.levels[1:]:
+            world[..., level, :, :] = (world[..., self.parents[level], :, :]
+                                       @ local[..., level, :, :])
+        return world
+
+    def evaluate(self, anim_index, time_ms):
+        """Return the world matrices of every bone at one time, (B, 4, 4),
+        or at an array of times, (T, B, 4, 4)."""
+        plan = self.plan(anim_index)
+        local = self.local_matrices(anim_index, time_ms)
+        world = np.empty_like(local)
+        world[...] = plan['world']
+        levels = plan['dynamic_levels']
+        if levels and len(levels[0]):
+            world[..., levels[0], :, :] = local[..., levels[0], :, :]
+        for level in levels[1:]:
+            if len(level):
+                world[..., level, :, :] = (world[..., self.parents[level], :, :]
+                                           @ local[..., level, :, :])
+        return world
+
+
+def compute_bone_matrices(m2: M2File, anim_index: int, time_ms: int,
+                          pose: BonePoseEvaluator = None) -> np.ndarray:
+    """Evaluate the world-space matrix of every bone as a (B, 4, 4) array."""
+    if pose is None:
+        pose = BonePoseEvaluator(m2.bones)
+    return pose.evaluate(anim_index, time_ms)
+
+
+class BakedClip:
+    """One animation sampled at a fixed step.
+
+    Bone matrices are stored as a compact float32 (F, B, 3, 4) array (the
+    constant bottom row is dropped). Deformed positions, (F, N, 3) float32,
+    are optional because they go stale whenever vertices or weights change.
+    """
 
-def evaluate_track(track: M2Track, anim_index: int, time_ms: int,
-                   anim_duration: int = 0, is_quat: bool = False):
-    """Evaluate an M2Track at a given animation index and local time."""
-    if not track.values:
-        return None
-    if anim_index < len(track.ranges):
-        start_idx, end_idx = track.ranges[anim_index]
-    else:
-        return None
-    if start_idx >= end_idx or start_idx >= len(track.timestamps):
-        return None
-    end_idx = min(end_idx, len(track.timestamps))
-    ts = track.timestamps
-    vals = track.values
-    base_time = ts[start_idx]
-    global_time = base_time + time_ms
-    if global_time <= ts[start_idx]:
-        return vals[start_idx]
-    if global_time >= ts[end_idx - 1]:
-        return vals[end_idx - 1]
-    lo, hi = start_idx, end_idx - 1
-    while lo < hi - 1:
-        mid = (lo + hi) // 2
-        if ts[mid] <= global_time:
-            lo = mid
-        else:
-            hi = mid
-    if track.interp_type == 0 or ts[hi] == ts[lo]:
-        return vals[lo]
-    t = (global_time - ts[lo]) / (ts[hi] - ts[lo])
-    if is_quat:
-        return _nlerp(vals[lo], vals[hi], t)
-    else:
-        return _lerp(vals[lo], vals[hi], t)
-
-
-def evaluate_bone_transform(bones, bone_index, anim_index, time_ms,
-                            anim_duration=0, cache=None):
-    """Compute the world-space 4x4 transform for a bone at a given time."""
-    if cache is not None and bone_index in cache:
-        return cache[bone_index]
-    bone = bones[bone_index]
-    pivot = np.array(bone.pivot, dtype=np.float64)
-    trans = evaluate_track(bone.translation, anim_index, time_ms, anim_duration)
-    rot = evaluate_track(bone.rotation, anim_index, time_ms, anim_duration,
-                         is_quat=True)
-    scl = evaluate_track(bone.scale, anim_index, time_ms, anim_duration)
-    t_neg_pivot = np.eye(4, dtype=np.float64)
-    t_neg_pivot[:3, 3] = -pivot
-    s_mat = np.eye(4, dtype=np.float64)
-    if scl is not None:
-        s_mat[0, 0] = scl[0]; s_mat[1, 1] = scl[1]; s_mat[2, 2] = scl[2]
-    r_mat = np.eye(4, dtype=np.float64)
-    if rot is not None:
-        r_mat[:3, :3] = _quat_to_matrix(rot)
-    t_trans = np.eye(4, dtype=np.float64)
-    if trans is not None:
-        t_trans[:3, 3] = trans
-    t_pivot = np.eye(4, dtype=np.float64)
-    t_pivot[:3, 3] = pivot
-    local = t_pivot @ t_trans @ r_mat @ s_mat @ t_neg_pivot
-    if bone.parent >= 0:
-        parent_mat = evaluate_bone_transform(bones, bone.parent, anim_index,
-                                             time_ms, anim_duration, cache)
-        world = parent_mat @ local
-    else:
-        world = local
-    if cache is not None:
-        cache[bone_index] = world
-    return world
-
-
-def compute_deformed_positions(m2: M2File, anim_index: int,
-                               time_ms: int) -> np.ndarray:
-    """Compute deformed vertex positions for a given animation frame."""
-    n_verts = len(m2.vertices)
-    result = np.zeros((n_verts, 3), dtype=np.float64)
-    anim_duration = 0
+    def __init__(self, step_ms, bone_matrices, positions=None):
+        self.step_ms = step_ms
+        self.bone_matrices = bone_matrices
+        self.positions = positions
+
+    @property
+    def n_frames(self):
+        return len(self.bone_matrices)
+
+    @property
+    def nbytes(self):
+        n = self.bone_matrices.nbytes
+        if self.positions is not None:
+            n += self.positions.nbytes
+        return n
+
+    def frame_index(self, time_ms):
+        """Return the frame sampled at exactly `time_ms`, or None."""
+        if time_ms % self.step_ms:
+            return None
+        frame = time_ms // self.step_ms
+        return frame if 0 <= frame < self.n_frames else None
+
+    def skin(self, engine: SkinningEngine):
+        """(Re)compute deformed positions for every frame."""
+        positions = np.empty((self.n_frames, len(engine.positions), 3),
+                             dtype=np.float32)
+        for f in range(self.n_frames):
+            positions[f] = engine.deform(self.frame_matrices(f))
+        self.positions = positions
+
+    def frame_matrices(self, frame):
+        """Expand a stored frame back to (B, 4, 4) float64 matrices."""
+        mats = np.zeros((self.bone_matrices.shape[1], 4, 4), dtype=np.float64)
+        mats[:, :3, :] = self.bone_matrices[frame]
+        mats[:, 3, 3] = 1.0
+        return mats
+
+
+def bake_clip(m2: M2File, anim_index: int, step_ms: int,
+              pose: BonePoseEvaluator, engine: SkinningEngine = None):
+    """Sample an animation every `step_ms` from 0 up to its duration.
+
+    Deformed positions are baked too when a SkinningEngine is given.
+    """
+    duration = 0
     if anim_index < len(m2.animations):
-        anim_duration = m2.animations[anim_index].duration
-    cache = {}
-    bone_matrices = []
-    for bi in range(len(m2.bones)):
-        mat = evaluate_bone_transform(m2.bones, bi, anim_index, time_ms,
-                                      anim_duration, cache)
-        bone_matrices.append(mat)
-    for vi in range(n_verts):
-        v = m2.vertices[vi]
-        pos = np.array([v.pos[0], v.pos[1], v.pos[2], 1.0], dtype=np.float64)
-        deformed = np.zeros(3, dtype=np.float64)
-        for j in range(4):
-            w = v.bone_weights[j]
-            if w == 0:
-                continue
-            bi = v.bone_indices[j]
-            if bi < len(bone_matrices):
-                transformed = bone_matrices[bi] @ pos
-                deformed += (w / 255.0) * transformed[:3]
-        result[vi] = deformed
-    return result
+        duration = m2.animations[anim_index].duration
+    times = np.arange(0, max(duration, 1), step_ms)
+    world = pose.evaluate(anim_index, times)
+    clip = BakedClip(step_ms, world[:, :, :3, :].astype(np.float32))
+    if engine is not None:
+        clip.skin(engine)
+    return clip
+
+
+class ClipCache:
+    """Memory-bounded LRU of baked clips keyed by (anim_index, step_ms)."""
+
+    def __init__(self, max_bytes=CLIP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._clips = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._clips)
+
+    @property
+    def nbytes(self):
+        return sum(clip.nbytes for clip in self._clips.values())
+
+    def get(self, key):
+        """Return a cached clip (marking it most recently used), or None."""
+        clip = self._clips.get(key)
+        if clip is not None:
+            self._clips.move_to_end(key)
+        return clip
+
+    def record(self, hit):
+        """Count one frame lookup as served from a cached clip or not."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def put(self, key, clip):
+        """Insert a clip, evicting least recently used clips over budget."""
+        self._clips.pop(key, None)
+        self._clips[key] = clip
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used clips until within budget (keeps one)."""
+        while self.nbytes > self.max_bytes and len(self._clips) > 1:
+            self._clips.popitem(last=False)
+
+    def discard_positions(self):
+        """Drop baked positions (after vertex or weight edits), keep bones."""
+        for clip in self._clips.values():
+            clip.positions = None
+
+    def clear(self):
+        self._clips.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -559,12 +920,84 @@ def _resolve_textures(m2, m2_path):
 
     return tex_files
 
+
+# ---------------------------------------------------------------------------
+# Geoset mesh building
+# ---------------------------------------------------------------------------
+
+def submesh_texture_keys(m2: M2File):
+    """Map submesh index -> texture table key, for submeshes that have one."""
+    sm_tex = {}
+    if m2.skin:
+        for i, sm in enumerate(m2.skin.submeshes):
+            if getattr(m2.skin, 'submesh_tex_index', None) and i in m2.skin.submesh_tex_index:
+                sm_tex[i] = m2.skin.submesh_tex_index[i]
+            elif m2.skin.submesh_tex_type and i in m2.skin.submesh_tex_type:
+                sm_tex[i] = m2.skin.submesh_tex_type[i]
+    return sm_tex
+
+
+def build_geoset_faces(m2: M2File):
+    """Build VTK face arrays per render key (group, variant, tex_key).
+
+    Each submesh's triangles are a slice of the skin's triangle index list;
+    slices sharing a render key are concatenated and reshaped into VTK's
+    [3, a, b, c, ...] cell layout in one step. The texture key comes from
+    submesh_texture_keys() (-1 when absent).
+
+    Returns (faces, tri_counts): render_key -> int32 face array, and
+    (group, variant) -> triangle count, including geosets without any.
+    """
+    sm_tex = submesh_texture_keys(m2)
+    tri = np.asarray(m2.skin.tri_indices, dtype=np.int32)
+    rk_slices = defaultdict(list)
+    for i, sm in enumerate(m2.skin.submeshes):
+        n_idx = sm.index_count - sm.index_count % 3
+        if n_idx <= 0:
+            continue
+        rk = (sm.group, sm.variant, sm_tex.get(i, -1))
+        rk_slices[rk].append(tri[sm.index_start:sm.index_start + n_idx])
+
+    faces = {}
+    tri_counts = dict.fromkeys(
+        ((sm.group, sm.variant) for sm in m2.skin.submeshes), 0)
+    for rk, slices in rk_slices.items():
+        tris = np.concatenate(slices).reshape(-1, 3)
+        cells = np.empty((len(tris), 4), dtype=np.int32)
+        cells[:, 0] = 3
+        cells[:, 1:] = tris
+        faces[rk] = cells.ravel()
+        tri_counts[(rk[0], rk[1])] += len(tris)
+    return faces, tri_counts
+
+
+def build_geoset_vertices(m2: M2File):
+    """Unique vertex indices referenced by each (group, variant).
+
+    Covers every index in each submesh's range, so a geoset's vertices are
+    exactly the ones picking treats as visible when it is shown.
+    """
+    tri = np.asarray(m2.skin.tri_indices, dtype=np.int64)
+    slices = defaultdict(list)
+    for sm in m2.skin.submeshes:
+        slices[(sm.group, sm.variant)].append(
+            tri[sm.index_start:sm.index_start + sm.index_count])
+    return {gv: np.unique(np.concatenate(parts))
+            for gv, parts in slices.items()}
+
+
 SELECTION_RADIUS = 0.05
+PICK_MAX_DISTANCE = 0.5   # ignore clicks farther than this from any vertex
+MIRROR_TOLERANCE = 0.05   # max distance between a vertex and its Y-flipped twin
 DESELECTION_RADIUS = 0.01  # tighter than selection to avoid removing too many
 WIDGET_RADIUS = 0.03
 WIDGET_OFFSET = 0.15     # distance to push widget outward along average normal
 BOX_DRAG_THRESHOLD = 20   # pixels: distinguish click from drag
 BOX_DRAG_TIMEOUT = 0.2   # seconds: max time after press to start a drag
+# Set M2_VIEWER_CHECK=1 to compare incremental display updates with a full
+# recompute after every update (slow; for debugging)
+CHECK_INCREMENTAL = bool(os.environ.get('M2_VIEWER_CHECK'))
+FRAME_INTERVAL_MS = 16   # min spacing of scheduled renders (~60 fps)
 
 # Default visibility: group -> set of variants (None = all variants)
 DEFAULT_VISIBLE = {0: None, 2: None, 3: None, 4: {1}, 5: {1}, 7: None, 13: {1}, 15: {1}}
@@ -605,17 +1038,716 @@ VIEW_LABELS = {
 }
 
 
+class SharedGeometry:
+    """Displayed vertex positions shared by every mesh in every view.
+
+    One float32 (N, 3) array backs a single vtkPoints. Each render key gets
+    one PolyData referencing those points (and one shared texture-coordinate
+    array), and the four views render that same PolyData through a shared
+    mapper. A deformation or edit is then one array write plus one
+    Modified() instead of a copy per render key per view.
+
+    With compact=True, each render key's PolyData instead holds only the
+    vertices its faces reference, plus a sorted local-to-global index map.
+    Writes go to the full buffer first and are scattered through each map,
+    so a single hair variant carries a few dozen points rather than the
+    whole model.
+    """
+
+    def __init__(self, points, uvs, compact=False):
+        self.points = np.ascontiguousarray(points, dtype=np.float32).copy()
+        self.vtk_points = pv.vtk_points(self.points, deep=False)
+        self.uvs = np.ascontiguousarray(uvs, dtype=np.float32)
+        self.tcoords = pv.convert_array(self.uvs, name='Texture Coordinates')
+        self.compact = compact
+        self.meshes = {}  # render key -> pv.PolyData
+        self.scalars = {}  # name -> (numpy buffer, vtk array) shared by meshes
+        # compact mode: render key -> {'vids', 'points', 'vtk_points', name -> local scalars}
+        self.local = {}
+
+    def mesh(self, rk, faces, textured):
+        """Return the shared PolyData for a render key, creating it once."""
+        mesh = self.meshes.get(rk)
+        if mesh is not None:
+            return mesh
+        mesh = pv.PolyData()
+        if self.compact:
+            cells = faces.reshape(-1, 4)
+            vids = np.unique(cells[:, 1:])
+            local_cells = cells.copy()
+            local_cells[:, 1:] = np.searchsorted(vids, cells[:, 1:])
+            buf = self.points[vids]
+            entry = {'vids': vids, 'points': buf,
+                     'vtk_points': pv.vtk_points(buf, deep=False)}
+            self.local[rk] = entry
+            mesh.SetPoints(entry['vtk_points'])
+            mesh.faces = local_cells.ravel()
+            if textured:
+                mesh.GetPointData().SetTCoords(pv.convert_array(
+                    self.uvs[vids], name='Texture Coordinates'))
+        else:
+            mesh.SetPoints(self.vtk_points)
+            mesh.faces = faces
+            if textured:
+                mesh.GetPointData().SetTCoords(self.tcoords)
+        self.meshes[rk] = mesh
+        for name, (buf, vtk_arr) in self.scalars.items():
+            self._attach_scalars(rk, mesh, name, buf, vtk_arr)
+        return mesh
+
+    def point_cloud(self):
+        """A PolyData over the shared points with no cells yet; give it
+        vertex cells to draw a subset of the vertices as points."""
+        cloud = pv.PolyData()
+        cloud.SetPoints(self.vtk_points)
+        return cloud
+
+    def update(self, values, indices=None):
+        """Write displayed positions (all, or just `indices`)."""
+        if indices is None:
+            self.points[:] = values
+        else:
+            indices = np.asarray(indices, dtype=np.intp)
+            self.points[indices] = values
+        self.vtk_points.Modified()
+        for entry in self.local.values():
+            vids = entry['vids']
+            if indices is None:
+                entry['points'][:] = self.points[vids]
+            else:
+                pos, hit = self._local_slots(vids, indices)
+                if not hit.any():
+                    continue
+                entry['points'][pos[hit]] = self.points[indices[hit]]
+            entry['vtk_points'].Modified()
+
+    @staticmethod
+    def _local_slots(vids, indices):
+        """Map global indices to slots in a sorted local-to-global map."""
+        pos = np.searchsorted(vids, indices)
+        pos_c = np.minimum(pos, len(vids) - 1)
+        return pos_c, vids[pos_c] == indices
+
+    def _attach_scalars(self, rk, mesh, name, buf, vtk_arr):
+        entry = self.local.get(rk)
+        if entry is None:
+            mesh.GetPointData().AddArray(vtk_arr)
+            return
+        local_buf = buf[entry['vids']]
+        entry[name] = (local_buf, pv.convert_array(local_buf, name=name))
+        mesh.GetPointData().AddArray(entry[name][1])
+
+    def set_point_scalars(self, name, values, indices=None):
+        """Attach (or refresh) a per-vertex scalar array shared by all meshes.
+
+        With `indices`, only those vertices are written; the array must
+        already exist.
+        """
+        entry = self.scalars.get(name)
+        if entry is None:
+            buf = np.ascontiguousarray(values, dtype=np.float32).copy()
+            vtk_arr = pv.convert_array(buf, name=name)
+            self.scalars[name] = (buf, vtk_arr)
+            for rk, mesh in self.meshes.items():
+                self._attach_scalars(rk, mesh, name, buf, vtk_arr)
+            return
+        buf, vtk_arr = entry
+        if indices is None:
+            buf[:] = values
+        else:
+            buf[indices] = values
+        vtk_arr.Modified()
+        for local in self.local.values():
+            local_buf, local_arr = local[name]
+            if indices is None:
+                local_buf[:] = buf[local['vids']]
+            else:
+                pos, hit = self._local_slots(local['vids'], indices)
+                if not hit.any():
+                    continue
+                local_buf[pos[hit]] = buf[indices[hit]]
+            local_arr.Modified()
+
+
+class PointGrid:
+    """Uniform-grid spatial hash for nearest and radius queries on points.
+
+    Points are bucketed by integer cell coordinates. Buckets are runs of a
+    sorted key array, so a query gathers every cell overlapping its search
+    box with one np.searchsorted instead of testing all points.
+
+    update() is incremental: a moved point keeps its now-stale bucket entry
+    (skipped on query) and is checked directly from an overflow list until
+    enough have moved to make a full rebuild worthwhile.
+    """
+
+    _BITS = 21  # bits per cell coordinate in the packed int64 key
+
+    def __init__(self, points, cell):
+        self.cell = float(cell)
+        self.rebuild(points)
+
+    def _cells(self, pts):
+        return np.floor(np.asarray(pts, dtype=np.float64) / self.cell).astype(np.int64)
+
+    def _keys(self, cells):
+        c = (cells + (1 << (self._BITS - 1))) & ((1 << self._BITS) - 1)
+        return (c[..., 0] << (2 * self._BITS)) | (c[..., 1] << self._BITS) | c[..., 2]
+
+    def rebuild(self, points):
+        """Re-bucket every point."""
+        self.points = np.array(points, dtype=np.float64).reshape(-1, 3)
+        self.keys = self._keys(self._cells(self.points))
+        self.built_keys = self.keys.copy()  # bucket each point is filed under
+        self.order = np.argsort(self.keys, kind='stable')
+        self.sorted_keys = self.keys[self.order]
+        self.overflow = np.zeros(0, dtype=np.intp)
+
+    def update(self, indices, values):
+        """Move the given points, re-bucketing only those that changed cell."""
+        indices = np.asarray(indices, dtype=np.intp)
+        self.points[indices] = values
+        self.keys[indices] = self._keys(self._cells(self.points[indices]))
+        moved = np.union1d(self.overflow, indices)
+        self.overflow = moved[self.keys[moved] != self.built_keys[moved]]
+        if len(self.overflow) > max(256, len(self.points) // 20):
+            self.rebuild(self.points)
+
+    def _in_box(self, lo, hi, mask=None):
+        """Indices of points whose cell lies within [lo, hi] (inclusive)."""
+        axes = [np.arange(lo[d], hi[d] + 1) for d in range(3)]
+        cells = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, 3)
+        keys = self._keys(cells)
+        starts = np.searchsorted(self.sorted_keys, keys, side='left')
+        counts = np.searchsorted(self.sorted_keys, keys, side='right') - starts
+        slots = (np.repeat(starts - np.cumsum(counts) + counts, counts)
+                 + np.arange(counts.sum()))
+        found = self.order[slots]
+        found = found[self.keys[found] == self.built_keys[found]]
+        if len(self.overflow):
+            ov_cells = self._cells(self.points[self.overflow])
+            inside = np.all((ov_cells >= lo) & (ov_cells <= hi), axis=1)
+            found = np.concatenate((found, self.overflow[inside]))
+        if mask is not None:
+            found = found[mask[found]]
+        return found
+
+    def query_radius(self, center, radius, mask=None):
+        """Sorted indices of points strictly closer than `radius` to center."""
+        center = np.asarray(center, dtype=np.float64)
+        found = self._in_box(self._cells(center - radius),
+                             self._cells(center + radius), mask)
+        dists = np.linalg.norm(self.points[found] - center, axis=1)
+        return np.sort(found[dists < radius])
+
+    def nearest(self, center, max_dist, mask=None):
+        """Return (index, distance) of the nearest point within max_dist
+        (lowest index on ties), or (None, inf)."""
+        center = np.asarray(center, dtype=np.float64)
+        reach = min(self.cell, max_dist)
+        while True:
+            found = self._in_box(self._cells(center - reach),
+                                 self._cells(center + reach), mask)
+            if len(found):
+                dists = np.linalg.norm(self.points[found] - center, axis=1)
+                best = dists.min()
+                # Anything closer than `reach` is guaranteed to be in the box
+                if best <= reach or reach >= max_dist:
+                    if best > max_dist:
+                        return None, float('inf')
+                    return int(found[dists == best].min()), float(best)
+            if reach >= max_dist:
+                return None, float('inf')
+            reach = min(reach * 2, max_dist)
+
+    def neighbour_pairs(self, queries):
+        """Candidate (query, point) index pairs: every point filed in one of
+        the 27 cells around each query's cell. Any point within `cell` of a
+        query is among them."""
+        if len(self.overflow):
+            self.rebuild(self.points)
+        offsets = np.stack(np.meshgrid(*[np.arange(-1, 2)] * 3, indexing='ij'),
+                           axis=-1).reshape(-1, 3)
+        cells = self._cells(queries)
+        keys = self._keys(cells[:, None, :] + offsets).ravel()
+        starts = np.searchsorted(self.sorted_keys, keys, side='left')
+        counts = np.searchsorted(self.sorted_keys, keys, side='right') - starts
+        slots = (np.repeat(starts - np.cumsum(counts) + counts, counts)
+                 + np.arange(counts.sum()))
+        query_ids = np.repeat(np.arange(len(cells)), len(offsets))
+        return np.repeat(query_ids, counts), self.order[slots]
+
+
+def build_mirror_map(points, tol=MIRROR_TOLERANCE):
+    """Pair each vertex with the closest vertex to its Y-flipped position.
+
+    Only vertices within `tol` of the flipped position can qualify, so a
+    grid with `tol`-sized cells yields every candidate. Ties go to the lowest
+    index, and a vertex whose best match is itself (on the Y=0 plane) has no
+    pair. Returns (src, dst) index arrays.
+    """
+    pts = np.asarray(points, dtype=np.float32)
+    mirrored = pts.copy()
+    mirrored[:, 1] *= -1
+    qi, pj = PointGrid(pts, tol).neighbour_pairs(mirrored)
+    dists = np.sum((pts[pj] - mirrored[qi]) ** 2, axis=1)
+    order = np.lexsort((pj, dists, qi))
+    qi, pj, dists = qi[order], pj[order], dists[order]
+    best = np.ones(len(qi), dtype=bool)
+    best[1:] = qi[1:] != qi[:-1]
+    qi, pj, dists = qi[best], pj[best], dists[best]
+    keep = (dists < tol * tol) & (pj != qi)
+    return qi[keep], pj[keep]
+
+
+def _file_digest(path):
+    """SHA-1 of a file's contents, or None if it can't be read."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _file_stamp(path):
+    """(real path, size, mtime) identifying a file's current contents."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return os.path.realpath(path), st.st_size, st.st_mtime_ns
+
+
+def load_mirror_cache(path, digest, tol=MIRROR_TOLERANCE):
+    """Read a mirror pair sidecar; None if missing or for other content."""
+    if digest is None or not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            if str(data['digest']) != digest or float(data['tol']) != tol:
+                return None
+            return data['src'], data['dst']
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        return None
+
+
+def save_mirror_cache(path, digest, src, dst, tol=MIRROR_TOLERANCE):
+    """Write a mirror pair sidecar next to the model (best effort)."""
+    if digest is None:
+        return
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            np.savez(f, digest=digest, tol=tol,
+                     src=np.asarray(src, dtype=np.int32),
+                     dst=np.asarray(dst, dtype=np.int32))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"  Warning: could not write mirror cache {path}: {e}")
+
+
+class VertexStore:
+    """Packed per-vertex arrays: the editor's copy of the M2 vertex data.
+
+    Edits are slice operations on these arrays. The M2's vertex objects are
+    read once at load and written back by sync_to_m2() (on save), which only
+    touches rows that differ from what the M2 currently holds. unsaved()
+    lists the rows that differ from the file on disk, as recorded by the
+    last mark_saved().
+    """
+
+    def __init__(self, m2: M2File):
+        verts = m2.vertices
+        self.positions = np.array([v.pos for v in verts],
+                                  dtype=np.float32).reshape(-1, 3)
+        self.normals = np.array([v.normal for v in verts],
+                                dtype=np.float32).reshape(-1, 3)
+        self.uvs = np.array([v.uv1 for v in verts],
+                            dtype=np.float32).reshape(-1, 2)
+        self.bone_weights = np.array([v.bone_weights for v in verts],
+                                     dtype=np.uint8).reshape(-1, 4)
+        self.bone_indices = np.array([v.bone_indices for v in verts],
+                                     dtype=np.uint8).reshape(-1, 4)
+        self.rest = self.positions.copy()  # positions as loaded
+        self._in_m2 = self._snapshot()   # what the M2 vertex objects hold
+        self._saved = self._snapshot()   # what the file on disk holds
+
+    def __len__(self):
+        return len(self.positions)
+
+    def moved(self):
+        """Indices of vertices whose position differs from the loaded one."""
+        return np.flatnonzero(np.any(self.positions != self.rest, axis=1))
+
+    def _snapshot(self):
+        return (self.positions.copy(), self.bone_weights.copy(),
+                self.bone_indices.copy())
+
+    def _changed_since(self, snapshot):
+        pos, weights, bones = snapshot
+        return np.flatnonzero(np.any(self.positions != pos, axis=1)
+                              | np.any(self.bone_weights != weights, axis=1)
+                              | np.any(self.bone_indices != bones, axis=1))
+
+    def unsaved(self):
+        """Indices of vertices changed since the last save (or load)."""
+        return self._changed_since(self._saved)
+
+    def mark_saved(self):
+        """Record the current arrays as what the file on disk holds."""
+        self._saved = self._snapshot()
+
+    def sync_to_m2(self, m2: M2File):
+        """Write changed positions, weights and bone indices to the M2."""
+        pos, weights, bones = self._in_m2
+        dirty = self._changed_since(self._in_m2)
+        verts = m2.vertices
+        for i, p, w, b in zip(dirty.tolist(),
+                              self.positions[dirty].tolist(),
+                              self.bone_weights[dirty].tolist(),
+                              self.bone_indices[dirty].tolist()):
+            v = verts[i]
+            v.pos[:] = p
+            v.bone_weights[:] = w
+            v.bone_indices[:] = b
+        pos[dirty] = self.positions[dirty]
+        weights[dirty] = self.bone_weights[dirty]
+        bones[dirty] = self.bone_indices[dirty]
+        return dirty
+
+
+def adjust_bone_weights(weights, bones, bone, delta):
+    """Add `delta` to each vertex's weight for `bone` and renormalize.
+
+    `weights` and `bones` are (N, 4) slot arrays (weights sum to 255). Per
+    vertex: the first slot holding `bone` is used; when raising a bone the
+    vertex lacks, it takes over the lightest slot. The new weight is
+    clamped to 0..255, the other slots are rescaled to fill the rest, the
+    rounding error goes to the heaviest slot, and emptied slots other than
+    the edited one get bone index 0. Vertices that can't change (weight
+    already at the limit, lowering an absent bone, or no other weight to
+    hand the remainder to) are left out.
+
+    Returns (rows, weights, bones): the changed rows and their new slots.
+    """
+    w = np.array(weights, dtype=np.int64).reshape(-1, 4)
+    b = np.array(bones, dtype=np.int64).reshape(-1, 4)
+    increase = delta > 0
+    all_rows = np.arange(len(w))
+
+    has_bone = b == bone
+    slot = np.argmax(has_bone, axis=1)
+    found = has_bone.any(axis=1)
+    if increase:
+        empty = np.flatnonzero(~found)
+        slot[empty] = np.argmin(w[empty], axis=1)
+        b[empty, slot[empty]] = bone
+        w[empty, slot[empty]] = 0
+        active = np.ones(len(w), dtype=bool)
+    else:
+        active = found.copy()
+
+    old = w[all_rows, slot]
+    new = np.clip(old + delta, 0, 255)
+    other_sum = w.sum(axis=1) - old
+    active &= new != old
+    if not increase:
+        active &= other_sum > 0
+
+    rows = np.flatnonzero(active)
+    w, b = w[rows], b[rows]
+    slot, new, other_sum = slot[rows], new[rows], other_sum[rows]
+    k = np.arange(len(rows))
+    w[k, slot] = new
+
+    # Distribute the remaining weight among the other slots
+    others = np.ones(w.shape, dtype=bool)
+    others[k, slot] = False
+    scale = np.divide(255 - new, other_sum, out=np.ones(len(rows)),
+                      where=other_sum > 0)
+    rescale = others & (other_sum > 0)[:, None]
+    w = np.where(rescale, np.rint(w * scale[:, None]).astype(np.int64), w)
+
+    # Fix rounding so each vertex sums to 255 — apply to the largest weight,
+    # not the edited slot, to avoid oscillation at small values
+    diff = 255 - w.sum(axis=1)
+    fix = np.argmax(w, axis=1)
+    off = np.flatnonzero(diff != 0)
+    w[off, fix[off]] = np.maximum(0, w[off, fix[off]] + diff[off])
+
+    # Remove zero-weight bones (set their index to 0)
+    b[(w == 0) & others] = 0
+    return rows, w, b
+
+
+class BoneInfluenceIndex:
+    """Inverted index from bone to the vertices it influences.
+
+    A CSR-style layout: entries are kept sorted by bone * n_verts + vertex,
+    so one bone's (vertex, weight) run is found with two binary searches.
+    Only slots with a non-zero weight count; when a vertex lists a bone in
+    several slots, the last one wins, as in the weight coloring.
+    """
+
+    def __init__(self, bone_indices, bone_weights, n_bones):
+        self.n_verts = len(bone_indices)
+        self.n_bones = n_bones
+        self._stride = max(self.n_verts, 1)
+        self.keys, self.weights = self._entries(
+            np.arange(self.n_verts), bone_indices, bone_weights)
+
+    def _entries(self, vertices, bone_indices, bone_weights):
+        """Sorted (keys, weights 0..1) for the given vertices' slots."""
+        verts = np.repeat(np.asarray(vertices, dtype=np.int64), 4)
+        bones = np.asarray(bone_indices, dtype=np.int64).reshape(-1)
+        w = np.asarray(bone_weights).reshape(-1)
+        keep = (w > 0) & (bones < self.n_bones)
+        keys = bones[keep] * self._stride + verts[keep]
+        w = (w[keep] / 255.0).astype(np.float32)
+        # Stable sort keeps slot order within a duplicate key; keep the last
+        order = np.argsort(keys, kind='stable')
+        keys, w = keys[order], w[order]
+        last = np.ones(len(keys), dtype=bool)
+        last[:-1] = keys[1:] != keys[:-1]
+        return keys[last], w[last]
+
+    def update(self, vertices, bone_indices, bone_weights):
+        """Replace the entries of `vertices` with their new slots."""
+        vertices = np.asarray(vertices, dtype=np.int64)
+        kept = ~np.isin(self.keys % self._stride, vertices)
+        keys, weights = self.keys[kept], self.weights[kept]
+        new_keys, new_weights = self._entries(vertices, bone_indices,
+                                              bone_weights)
+        at = np.searchsorted(keys, new_keys)
+        self.keys = np.insert(keys, at, new_keys)
+        self.weights = np.insert(weights, at, new_weights)
+
+    def influence(self, bone):
+        """(vertices, weights 0..1) influenced by `bone`."""
+        lo, hi = np.searchsorted(
+            self.keys, [bone * self._stride, (bone + 1) * self._stride])
+        return self.keys[lo:hi] - bone * self._stride, self.weights[lo:hi]
+
+    def counts(self):
+        """Number of vertices each bone influences."""
+        return np.bincount(self.keys // self._stride, minlength=self.n_bones)
+
+
+def bone_weight_column(bone_indices, bone_weights, bone):
+    """Per-vertex weight (0..1) of `bone` from (N, 4) slot arrays.
+
+    Computed from the slots directly, without a BoneInfluenceIndex: the last
+    slot holding `bone` with a non-zero weight wins, 0 where there is none.
+    """
+    bones = np.asarray(bone_indices).reshape(-1, 4)
+    weights = np.asarray(bone_weights).reshape(-1, 4)
+    hit = (bones == bone) & (weights > 0)
+    last = 3 - np.argmax(hit[:, ::-1], axis=1)
+    w = weights[np.arange(len(weights)), last] / 255.0
+    return np.where(hit.any(axis=1), w, 0.0).astype(np.float32)
+
+
+class Selection:
+    """Selected vertex indices, held as a sorted index array plus a mask.
+
+    Changes are boolean-mask set operations; `indices` is refreshed from the
+    mask afterwards and never modified in place, so it can be kept as a
+    snapshot.
+    """
+
+    def __init__(self, n_verts):
+        self.mask = np.zeros(n_verts, dtype=bool)
+        self.indices = np.zeros(0, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __bool__(self):
+        return len(self.indices) > 0
+
+    def _sync(self):
+        self.indices = np.flatnonzero(self.mask)
+
+    def set(self, indices):
+        self.mask[:] = False
+        self.mask[np.asarray(indices, dtype=np.intp)] = True
+        self._sync()
+
+    def add(self, indices):
+        self.mask[np.asarray(indices, dtype=np.intp)] = True
+        self._sync()
+
+    def remove(self, indices):
+        self.mask[np.asarray(indices, dtype=np.intp)] = False
+        self._sync()
+
+    def toggle(self, indices):
+        self.mask[np.unique(np.asarray(indices, dtype=np.intp))] ^= True
+        self._sync()
+
+
+UNDO_MEMORY_BYTES = 32 * 1024 * 1024  # memory budget for the undo journal
+
+# On-disk vertex record ('<3f4B4B3f2f2f', 48 bytes) and the header field
+# holding the vertex block's count/offset pair
+M2_VERTEX_DTYPE = np.dtype([
+    ('pos', '<f4', 3), ('bone_weights', 'u1', 4), ('bone_indices', 'u1', 4),
+    ('normal', '<f4', 3), ('uv1', '<f4', 2), ('uv2', '<f4', 2),
+])
+M2_VERTICES_FIELD = 0x44
+
+
+def patch_m2_vertices(path, store, indices):
+    """Overwrite position and bone fields of the given vertex records of an
+    M2 file in place.
+
+    Returns False without writing anything when the file's vertex block
+    doesn't match the store (different magic, vertex count or truncated).
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            header = f.read(M2_VERTICES_FIELD + 8)
+    except OSError:
+        return False
+    if len(header) < M2_VERTICES_FIELD + 8 or header[:4] != b'MD20':
+        return False
+    count, offset = struct.unpack_from('<2I', header, M2_VERTICES_FIELD)
+    if count != len(store) or offset + count * M2_VERTEX_DTYPE.itemsize > size:
+        return False
+    indices = np.asarray(indices, dtype=np.intp)
+    if len(indices):
+        records = np.memmap(path, dtype=M2_VERTEX_DTYPE, mode='r+',
+                            offset=offset, shape=(count,))
+        records['pos'][indices] = store.positions[indices]
+        records['bone_weights'][indices] = store.bone_weights[indices]
+        records['bone_indices'][indices] = store.bone_indices[indices]
+        records.flush()
+        del records
+    return True
+
+
+class JournalEntry:
+    """One undoable edit: the affected vertex indices and their values
+    before and after (tuples of per-vertex arrays, one per field)."""
+
+    __slots__ = ('seq', 'indices', 'before', 'after', 'group')
+
+    def __init__(self, seq, indices, before, after, group=None):
+        self.seq = seq
+        self.indices = indices
+        self.before = before
+        self.after = after
+        self.group = group  # edits sharing a group token coalesce
+
+    @property
+    def nbytes(self):
+        return self.indices.nbytes + sum(a.nbytes for a in self.before + self.after)
+
+    def merge(self, indices, before, after):
+        """Fold a later edit in: keep the earliest `before`, the latest
+        `after` for each vertex."""
+        merged = np.union1d(self.indices, indices)
+        old = np.searchsorted(merged, self.indices)
+        new = np.searchsorted(merged, indices)
+
+        def combine(first, second, first_rows, second_rows):
+            out = np.empty((len(merged),) + first.shape[1:], dtype=first.dtype)
+            out[second_rows] = second
+            out[first_rows] = first
+            return out
+
+        self.before = tuple(combine(b0, b1, old, new)
+                            for b0, b1 in zip(self.before, before))
+        self.after = tuple(combine(a1, a0, new, old)
+                           for a0, a1 in zip(self.after, after))
+        self.indices = merged
+
+
+class UndoJournal:
+    """Undo/redo history of per-vertex deltas, one stack per edit kind.
+
+    Undoing or redoing an entry only touches the vertices it changed.
+    Recording with the `group` of the kind's newest entry merges into it
+    (one undo step per widget drag). When the journal outgrows `max_bytes`,
+    redo entries are dropped first (the furthest redo first), then the
+    oldest undo entries across all kinds.
+    """
+
+    def __init__(self, max_bytes=UNDO_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._undo = defaultdict(deque)
+        self._redo = defaultdict(deque)
+        self._seq = 0
+
+    def record(self, kind, indices, before=(), after=(), group=None):
+        """Push an edit of `kind`; this clears that kind's redo stack."""
+        indices = np.asarray(indices, dtype=np.intp)
+        before = tuple(np.array(b) for b in before)
+        after = tuple(np.array(a) for a in after)
+        for entry in self._redo.pop(kind, ()):
+            self.nbytes -= entry.nbytes
+        stack = self._undo[kind]
+        if group is not None and stack and stack[-1].group is group:
+            self.nbytes -= stack[-1].nbytes
+            stack[-1].merge(indices, before, after)
+            self.nbytes += stack[-1].nbytes
+        else:
+            self._seq += 1
+            stack.append(JournalEntry(self._seq, indices, before, after, group))
+            self.nbytes += stack[-1].nbytes
+        self._trim()
+
+    def undo(self, kind):
+        """Pop the newest entry of `kind` onto its redo stack (or None)."""
+        if not self._undo[kind]:
+            return None
+        entry = self._undo[kind].pop()
+        entry.group = None
+        self._redo[kind].append(entry)
+        return entry
+
+    def redo(self, kind):
+        """Move the newest redo entry of `kind` back to undo (or None)."""
+        if not self._redo[kind]:
+            return None
+        entry = self._redo[kind].pop()
+        entry.seq = self._seq = self._seq + 1
+        self._undo[kind].append(entry)
+        return entry
+
+    def _trim(self):
+        # Always keep the newest undo entry, even if it alone is over budget
+        while self.nbytes > self.max_bytes:
+            stacks = [st for st in self._redo.values() if st]
+            if stacks:
+                # A redo stack's bottom entry is the last one it would redo
+                furthest = max(stacks, key=lambda st: st[0].seq)
+                self.nbytes -= furthest.popleft().nbytes
+                continue
+            stacks = [st for st in self._undo.values() if st]
+            if sum(len(st) for st in stacks) <= 1:
+                break
+            oldest = min(stacks, key=lambda st: st[0].seq)
+            self.nbytes -= oldest.popleft().nbytes
+
+
 class M2Viewer:
-    def __init__(self, m2: M2File, texture_paths: dict = None):
+    def __init__(self, m2: M2File, texture_paths: dict = None,
+                 compact_meshes: bool = False,
+                 undo_bytes: int = UNDO_MEMORY_BYTES,
+                 geoset_faces: tuple = None):
         self.m2 = m2
-        self.selected = []
-        self.original_positions = {}
-        self.points = np.array([v.pos for v in m2.vertices], dtype=np.float32)
+        # Vertex data is edited in the packed store and written to the M2
+        # only on save; self.points is the store's position array
+        self.store = VertexStore(m2)
+        self.selection = Selection(len(self.store))
+        self.points = self.store.positions
 
         # UV coordinates for all vertices (V flipped for OpenGL convention)
-        self.uvs = np.array(
-            [[v.uv1[0], 1.0 - v.uv1[1]] for v in m2.vertices], dtype=np.float32
-        )
+        self.uvs = self.store.uvs.copy()
+        self.uvs[:, 1] = 1.0 - self.uvs[:, 1]
 
         # Load textures: key -> pv.Texture
         # key matches texture_paths keys (texture table index or texture type)
@@ -632,32 +1764,11 @@ class M2Viewer:
                 except Exception as e:
                     print(f"  Warning: failed to load texture {blp_path}: {e}")
 
-        # Build per-submesh texture mapping: submesh index -> tex table key
-        self._sm_tex = {}
-        if m2.skin:
-            for i, sm in enumerate(m2.skin.submeshes):
-                if getattr(m2.skin, 'submesh_tex_index', None) and i in m2.skin.submesh_tex_index:
-                    self._sm_tex[i] = m2.skin.submesh_tex_index[i]
-                elif m2.skin.submesh_tex_type and i in m2.skin.submesh_tex_type:
-                    self._sm_tex[i] = m2.skin.submesh_tex_type[i]
-
         # Build face data keyed by render key (group, variant, tex_key).
         # Each submesh's faces go into the bucket matching its texture so
         # faces within the same geoset can have different textures.
-        tri = m2.skin.tri_indices
-        self.gv_faces = {}   # render_key -> face array
-        rk_tris = defaultdict(list)
-        for i, sm in enumerate(m2.skin.submeshes):
-            tex_key = self._sm_tex.get(i, -1)
-            rk = (sm.group, sm.variant, tex_key)
-            for j in range(sm.index_start, sm.index_start + sm.index_count, 3):
-                rk_tris[rk].append((tri[j], tri[j+1], tri[j+2]))
-        for rk, tlist in rk_tris.items():
-            n = len(tlist)
-            faces = np.zeros(n * 4, dtype=np.int32)
-            for i, (a, b, c) in enumerate(tlist):
-                faces[i*4] = 3; faces[i*4+1] = a; faces[i*4+2] = b; faces[i*4+3] = c
-            self.gv_faces[rk] = faces
+        # gv_faces: render_key -> face array; gv_tri_counts: (group, variant) -> tris
+        self.gv_faces, self.gv_tri_counts = geoset_faces or build_geoset_faces(m2)
 
         # Map (group, variant) -> list of render keys for that geoset
         self.gv_render_keys = defaultdict(list)
@@ -681,12 +1792,27 @@ class M2Viewer:
             else:
                 self.gv_visible[gv] = False
 
-        # Per-subplot actors and meshes: view -> {render_key -> actor/mesh}
+        # Visible-vertex mask, kept in step with gv_visible. Geosets can
+        # share vertices, so each vertex counts how many shown geosets use it.
+        self.gv_verts = build_geoset_vertices(m2)
+        self._vis_refs = np.zeros(len(self.store), dtype=np.int32)
+        self.visible_mask = np.zeros(len(self.store), dtype=bool)
+        for gv, shown in self.gv_visible.items():
+            if shown:
+                self._count_gv_verts(gv, 1)
+
+        # Per-subplot actors: view -> {render_key -> actor}. All views share
+        # one mesh per render key, backed by one vertex buffer. Actors are
+        # created the first time a render key is shown and then only hidden.
         self.view_actors = {v: {} for v in ALL_VIEWS}
-        self.view_meshes = {v: {} for v in ALL_VIEWS}
-        # Selection actors/meshes per view
-        self.selection_actors = {v: None for v in ALL_VIEWS}
-        self.selection_meshes = {v: None for v in ALL_VIEWS}
+        # compact_meshes: each render key keeps only the vertices it uses
+        self.geometry = SharedGeometry(self.points, self.uvs,
+                                       compact=compact_meshes)
+        # Selection dots: one point cloud over the shared vertex buffer,
+        # drawn by a persistent actor per view (created on first selection)
+        self.selection_cloud = None
+        self.selection_actors = {}
+        self._selection_shown = None   # indices the cloud's cells hold
 
         # Popout state
         self.expanded_group = None
@@ -703,16 +1829,16 @@ class M2Viewer:
         self._syncing_zoom = False
         self._syncing_widgets = False
 
-        # Separate undo/redo stacks for motion (vertex positions), selection, and weights
-        self.motion_undo = []
-        self.motion_redo = []
-        self.selection_undo = []
-        self.selection_redo = []
-        self.weight_undo = []
-        self.weight_redo = []
+        # Undo/redo journal with separate stacks for 'motion' (vertex
+        # positions), 'selection' and 'weights'
+        self.journal = UndoJournal(undo_bytes)
+        self._drag_group = None  # journal group of the current widget drag
 
         # Save path (defaults to loaded file)
         self.save_path = str(m2.path)
+        # Stamp of the file whose vertex data matches the M2 object; saving
+        # to it can patch vertex records instead of rewriting everything
+        self._disk_stamp = _file_stamp(self.save_path)
 
         # Mode toggle: True = selection/edit, False = camera
         self.selection_mode = False
@@ -727,24 +1853,61 @@ class M2Viewer:
         self._rb_renderer = None     # renderer holding the rubber band actor
         self._widget_dragging = False  # True when a sphere widget is being dragged
         self._in_pick = False          # re-entrance guard for pick/select
-
-        # Pre-compute mirror pairs from original vertex positions (Y=0 symmetry)
-        self._mirror_map = self._build_mirror_map()
+        self._pick_grid = None         # PointGrid over displayed points (lazy)
+
+        # Render scheduling: handlers mark views dirty, one render per tick
+        self._dirty_views = set()
+        self._render_timer_id = None
+        self._last_render = 0.0        # perf_counter of the last window render
+        # Input coalescing: key -> latest deferred handler, run on that tick
+        self._deferred = {}
+        self.coalesced_events = defaultdict(int)  # key -> dropped events
+
+        # Mirror pairs (Y=0 symmetry) come from the positions as loaded and
+        # are built on the first mirror. The file's content hash keys the
+        # sidecar; the stamp tells whether the file is still the one loaded.
+        self._mirror_map = None
+        self._mirror_stamp = _file_stamp(m2.path)
 
         # Animation preview state
         self.anim_preview = False      # True when showing animation pose
         self.anim_index = 0            # current animation index
         self.anim_time_ms = 0          # current local time within animation
         self.anim_step_ms = 33         # frame step size (~30 fps)
+        self.anim_bake = False         # True to sample whole clips into a cache
+        self.bake_positions = True     # also bake deformed positions
+        self._clip_cache = ClipCache()
+
+        # Real-time playback state (Space); time advances with the wall clock
+        self.anim_playing = False
+        self._play_timer_id = None
+        self._play_origin = (0.0, 0)   # (perf_counter at anchor, anim time)
+        self._play_last = 0.0          # perf_counter of the last shown frame
+        self._play_fps = 0.0           # smoothed achieved frame rate
+        self._play_skin_ms = 0.0       # last frame's pose + skinning cost
+        self._play_render_ms = 0.0     # last frame's render cost
+        self._play_skipped = 0         # animation frames skipped to keep up
 
         # Bone weight visualization state
         self.bone_vis_mode = False     # True when showing bone weight colors
         self.bone_vis_index = 0        # which bone to visualize weights for
         self.weight_edit_bone = 0      # bone index for weight editing
         self.weight_edit_delta = 25    # weight change per W/Shift+W press
+        self._bone_lut = None          # coolwarm lookup table, built on first use
+        self._bone_shown = None        # bone whose weights the scalars hold
 
         # Cached deformed positions (updated each animation frame)
         self._deformed_points = None   # np array or None when in rest pose
+        self._bone_matrices = None     # (B, 4, 4) bone matrices of that frame
+
+        # Packed skinning arrays; rest positions alias self.points so vertex
+        # edits are picked up without repacking
+        self._skin = SkinningEngine(self.points, self.store.bone_indices,
+                                    self.store.bone_weights, len(m2.bones))
+        self._pose = BonePoseEvaluator(m2.bones)
+        self._bone_index = BoneInfluenceIndex(self.store.bone_indices,
+                                              self.store.bone_weights,
+                                              len(m2.bones))
 
     def _setup_zoom_sync(self):
         """Sync zoom and pan across all 4 views, lock preset camera angles.
@@ -817,7 +1980,7 @@ class M2Viewer:
                     if idx != source_idx:
                         cam = self.plotter.renderers[idx].GetActiveCamera()
                         cam.SetParallelScale(scale)
-                self.plotter.render()
+                self.request_render(ALL_VIEWS)
                 self._syncing_zoom = False
             return on_modified
 
@@ -828,69 +1991,81 @@ class M2Viewer:
             cam.AddObserver('ModifiedEvent', make_observer(idx))
 
     def _make_mesh(self, rk):
-        """Build a PyVista mesh for a render key (group, variant, tex_key)."""
-        mesh = pv.PolyData(self.points.copy(), self.gv_faces[rk])
-        tex_key = rk[2]
-        if tex_key in self.pv_textures:
-            mesh.active_texture_coordinates = self.uvs.copy()
-        return mesh
+        """Return the shared PyVista mesh for a render key (group, variant, tex_key)."""
+        return self.geometry.mesh(rk, self.gv_faces[rk], rk[2] in self.pv_textures)
 
-    def _add_mesh_all_views(self, gv):
-        """Add all render meshes for a (group, variant) to all 4 subplots."""
-        for rk in self.gv_render_keys[gv]:
-            tex_key = rk[2]
-            pv_tex = self.pv_textures.get(tex_key)
-            for view in ALL_VIEWS:
-                mesh = self._make_mesh(rk)
-                self.plotter.subplot(*view)
-                name = f"gv_{rk[0]}_{rk[1]}_{rk[2]}_{view[0]}{view[1]}"
-                if pv_tex is not None:
-                    actor = self.plotter.add_mesh(
-                        mesh, texture=pv_tex, show_edges=True,
-                        edge_color="gray", opacity=1.0, name=name,
-                    )
-                else:
-                    actor = self.plotter.add_mesh(
-                        mesh, color="lightblue", show_edges=True,
-                        edge_color="gray", opacity=1.0, name=name,
-                    )
-                self.view_actors[view][rk] = actor
-                self.view_meshes[view][rk] = mesh
-
-    def _remove_mesh_all_views(self, gv):
-        """Remove all render meshes for a (group, variant) from all subplots."""
-        for rk in self.gv_render_keys[gv]:
-            for view in ALL_VIEWS:
-                actor = self.view_actors[view].get(rk)
-                if actor is not None:
-                    self.plotter.subplot(*view)
-                    self.plotter.remove_actor(actor)
-                    self.view_actors[view][rk] = None
-                    self.view_meshes[view][rk] = None
+    def _ensure_actors(self, rk):
+        """Create a render key's actors in all 4 subplots, once.
+
+        The first view builds the actor with add_mesh; the others get
+        shallow copies sharing its mapper, property and texture. After that,
+        showing/hiding is SetVisibility and bone coloring is a mapper switch.
+        """
+        if rk in self.view_actors[FREE]:
+            return
+        mesh = self._make_mesh(rk)
+        pv_tex = self.pv_textures.get(rk[2])
+        if pv_tex is not None:
+            style = dict(texture=pv_tex)
+        else:
+            style = dict(color="lightblue")
+        first = None
+        for view in ALL_VIEWS:
+            self.plotter.subplot(*view)
+            name = f"gv_{rk[0]}_{rk[1]}_{rk[2]}_{view[0]}{view[1]}"
+            if first is None:
+                actor = first = self.plotter.add_mesh(
+                    mesh, show_edges=True, edge_color="gray", opacity=1.0,
+                    name=name, **style,
+                )
+            else:
+                actor = vtk.vtkActor()
+                actor.ShallowCopy(first)
+                self.plotter.add_actor(actor, name=name)
+            self.view_actors[view][rk] = actor
+        if self.bone_vis_mode:
+            self._set_bone_coloring(rk, True)
 
     def _update_gv(self, gv):
         """Update visibility for a (group, variant)."""
-        if self.gv_visible[gv]:
-            self._remove_mesh_all_views(gv)
-            self._add_mesh_all_views(gv)
-        else:
-            self._remove_mesh_all_views(gv)
+        visible = self.gv_visible[gv]
+        for rk in self.gv_render_keys[gv]:
+            if visible:
+                self._ensure_actors(rk)
+            elif rk not in self.view_actors[FREE]:
+                continue
+            for view in ALL_VIEWS:
+                self.view_actors[view][rk].SetVisibility(visible)
 
     def _is_group_visible(self, group):
         return any(self.gv_visible.get((group, v), False)
                    for v in self.group_variants[group])
 
+    def _count_gv_verts(self, gv, delta):
+        idx = self.gv_verts.get(gv)
+        if idx is None or not len(idx):
+            return
+        self._vis_refs[idx] += delta
+        self.visible_mask[idx] = self._vis_refs[idx] > 0
+
+    def _mark_gv_visible(self, gv, state):
+        """Set a geoset's visibility flag and patch the visible-vertex mask."""
+        state = bool(state)
+        if self.gv_visible.get(gv, False) != state:
+            self._count_gv_verts(gv, 1 if state else -1)
+        self.gv_visible[gv] = state
+
     def _set_group_visible(self, group, state):
         for v in self.group_variants[group]:
             key = (group, v)
-            self.gv_visible[key] = state
+            self._mark_gv_visible(key, state)
             self._update_gv(key)
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
     def _set_variant_visible(self, key, state):
-        self.gv_visible[key] = state
+        self._mark_gv_visible(key, state)
         self._update_gv(key)
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
     def _close_popout(self):
         for w, label_name in self.variant_widgets:
@@ -925,8 +2100,7 @@ class M2Viewer:
 
         for i, v in enumerate(variants):
             key = (group, v)
-            n_tri = sum(len(self.gv_faces[rk]) // 4 for rk in self.gv_render_keys[key])
-            vlabel = f"v{v} ({n_tri} tri)"
+            vlabel = f"v{v} ({self.gv_tri_counts[key]} tri)"
             y = popout_y + (len(variants) - 1 - i) * ROW_H
 
             def make_cb(k):
@@ -959,128 +2133,127 @@ class M2Viewer:
             self._set_group_visible(group, state)
         return callback
 
-    # --- Undo / Redo (separate stacks for motion and selection) ---
+    # --- Undo / Redo (journal stacks for motion, selection and weights) ---
 
-    def _capture_positions(self):
-        """Snapshot positions of all ever-touched vertices."""
-        return {idx: list(self.m2.vertices[idx].pos)
-                for idx in self.original_positions}
+    def _edit_positions(self, indices, values, group=None):
+        """Move vertices and record the move in the undo journal."""
+        before = self.points[indices]
+        self._set_positions(indices, values)
+        self.journal.record('motion', indices, (before,), (self.points[indices],),
+                            group=group)
 
-    def _capture_selection(self):
-        """Snapshot the current selection."""
-        return list(self.selected)
-
-    def _apply_positions(self, positions):
-        """Restore vertex positions from a snapshot."""
-        all_touched = set(positions.keys()) | set(self.original_positions.keys())
-        changed = []
-        for idx in all_touched:
-            target = positions.get(idx, self.original_positions.get(idx))
-            if target is None:
-                continue
-            cur = self.m2.vertices[idx].pos
-            if cur[0] != target[0] or cur[1] != target[1] or cur[2] != target[2]:
-                self.m2.vertices[idx].pos[:] = target
-                self.points[idx] = target
-                changed.append(idx)
+    def _record_selection(self, before):
+        """Journal a selection change as the indices it toggled."""
+        toggled = np.setxor1d(before, self.selection.indices)
+        if len(toggled):
+            self.journal.record('selection', toggled)
 
-        if changed:
-            for view in ALL_VIEWS:
-                for key, mesh in self.view_meshes[view].items():
-                    if mesh is not None:
-                        mesh.points[changed] = self.points[changed]
-                        mesh.Modified()
+    def _apply_positions(self, indices, positions):
+        """Restore vertex positions from a journal entry."""
+        self._set_positions(indices, positions)
+        self._show_points(self.points[indices], indices)
 
         self._update_selection_display()
-        if self.selected and self.selection_mode:
+        if self.selection and self.selection_mode:
             self._update_widgets()
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
-    def _apply_selection(self, selection):
-        """Restore selection from a snapshot."""
-        self.selected = list(selection)
+    def _apply_selection(self, toggled):
+        """Flip the selection state of the vertices a journal entry changed."""
+        self.selection.toggle(toggled)
         self._update_selection_display()
-        if self.selected and self.selection_mode:
+        if self.selection and self.selection_mode:
             self._update_widgets()
         elif self.widgets:
             self.plotter.clear_sphere_widgets()
             self.widgets.clear()
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
     def undo_motion(self):
-        if not self.motion_undo:
-            return
-        self.motion_redo.append(self._capture_positions())
-        self._apply_positions(self.motion_undo.pop())
+        entry = self.journal.undo('motion')
+        if entry is not None:
+            self._apply_positions(entry.indices, *entry.before)
 
     def redo_motion(self):
-        if not self.motion_redo:
-            return
-        self.motion_undo.append(self._capture_positions())
-        self._apply_positions(self.motion_redo.pop())
+        entry = self.journal.redo('motion')
+        if entry is not None:
+            self._apply_positions(entry.indices, *entry.after)
 
     def undo_selection(self):
-        if not self.selection_undo:
-            return
-        self.selection_redo.append(self._capture_selection())
-        self._apply_selection(self.selection_undo.pop())
+        entry = self.journal.undo('selection')
+        if entry is not None:
+            self._apply_selection(entry.indices)
 
     def redo_selection(self):
-        if not self.selection_redo:
-            return
-        self.selection_undo.append(self._capture_selection())
-        self._apply_selection(self.selection_redo.pop())
-
-    def _capture_weights(self, indices):
-        """Snapshot bone weights and indices for the given vertex indices."""
-        snap = {}
-        for vi in indices:
-            v = self.m2.vertices[vi]
-            snap[vi] = (list(v.bone_weights), list(v.bone_indices))
-        return snap
-
-    def _apply_weights(self, snapshot):
-        """Restore bone weights from a snapshot."""
-        for vi, (weights, indices) in snapshot.items():
-            v = self.m2.vertices[vi]
-            v.bone_weights[:] = weights
-            v.bone_indices[:] = indices
-        if self.bone_vis_mode:
-            self._refresh_bone_colors()
-        if self.anim_preview:
-            self._apply_anim_frame()
-        self.plotter.render()
+        entry = self.journal.redo('selection')
+        if entry is not None:
+            self._apply_selection(entry.indices)
+
+    def _apply_weights(self, idx, weights, bones):
+        """Restore bone weights from a journal entry."""
+        self._set_weights(idx, weights, bones)
+        self._reskin_vertices(idx)
+        self.request_render(ALL_VIEWS)
+
+    def _set_weights(self, indices, weights, bones):
+        """Write bone weights/indices to the store and the skinning engine."""
+        self.store.bone_weights[indices] = weights
+        self.store.bone_indices[indices] = bones
+        self._skin.set_weights(indices, self.store.bone_indices[indices],
+                               self.store.bone_weights[indices])
+        self._bone_index.update(indices, self.store.bone_indices[indices],
+                                self.store.bone_weights[indices])
+        self._update_bone_scalars(indices)
+        self._clip_cache.discard_positions()
 
     def undo_weights(self):
-        if not self.weight_undo:
-            return
-        before, after = self.weight_undo.pop()
-        self.weight_redo.append((before, after))
-        self._apply_weights(before)
+        entry = self.journal.undo('weights')
+        if entry is not None:
+            self._apply_weights(entry.indices, *entry.before)
 
     def redo_weights(self):
-        if not self.weight_redo:
-            return
-        before, after = self.weight_redo.pop()
-        self.weight_undo.append((before, after))
-        self._apply_weights(after)
+        entry = self.journal.redo('weights')
+        if entry is not None:
+            self._apply_weights(entry.indices, *entry.after)
 
     # --- Save ---
 
     def _edited_indices(self):
         """Return the set of vertex indices that have been moved."""
-        edited = set()
-        for i, old_pos in self.original_positions.items():
-            cur = self.m2.vertices[i].pos
-            if old_pos[0] != cur[0] or old_pos[1] != cur[1] or old_pos[2] != cur[2]:
-                edited.add(i)
-        return edited or None
+        return set(self.store.moved().tolist()) or None
+
+    def _write_m2(self, path):
+        """Write the edited model to `path`.
+
+        If `path` is still the file last loaded or saved, only the vertex
+        records changed since then are patched in place. Otherwise (or if
+        its layout doesn't match) the whole file is written to a temporary
+        file and swapped in atomically. The store only counts the edits as
+        saved once either write has succeeded.
+        """
+        self.store.sync_to_m2(self.m2)
+        unsaved = self.store.unsaved()
+        stamp = _file_stamp(path)
+        if (stamp is not None and stamp == self._disk_stamp
+                and patch_m2_vertices(path, self.store, unsaved)):
+            print(f"Saved to {path} (patched {len(unsaved)} vertices)")
+        else:
+            tmp = f"{path}.tmp"
+            try:
+                save_m2(self.m2, tmp, edited_indices=self._edited_indices())
+                if os.path.exists(path):
+                    shutil.copymode(path, tmp)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            print(f"Saved to {path}")
+        self.store.mark_saved()
+        self._disk_stamp = _file_stamp(path)
 
     def save(self):
         """Save M2 to disk."""
-        edited = self._edited_indices()
-        save_m2(self.m2, self.save_path, edited_indices=edited)
-        print(f"Saved to {self.save_path}")
+        self._write_m2(self.save_path)
 
     def save_as(self):
         """Open a file dialog and save M2 to the chosen path."""
@@ -1095,9 +2268,87 @@ class M2Viewer:
         root.destroy()
         if path:
             self.save_path = path
-            edited = self._edited_indices()
-            save_m2(self.m2, path, edited_indices=edited)
-            print(f"Saved to {path}")
+            self._write_m2(path)
+
+    # --- Render scheduling ---
+
+    def _setup_render_scheduler(self):
+        iren = self.plotter.iren.interactor
+        iren.AddObserver('TimerEvent', self._on_render_timer)
+        # Any full window render (ours or the interactor's, e.g. during
+        # camera interaction) satisfies pending requests
+        iren.GetRenderWindow().AddObserver('EndEvent', self._on_window_rendered)
+
+    def request_render(self, views):
+        """Mark `views` for redraw on the next event-loop tick.
+
+        Handlers call this instead of rendering, so one user action renders
+        once no matter how many handlers it runs through. The tick waits
+        until FRAME_INTERVAL_MS has passed since the last render, so faster
+        event streams fold into one frame. Callers pass the
+        views whose content or camera changed: meshes, selection dots,
+        widgets and labels appear in all four, a rubber band only in its own.
+        """
+        self._dirty_views.update(views)
+        iren = self.plotter.iren.interactor
+        if self._render_timer_id is None and iren.GetInitialized():
+            elapsed = (time.perf_counter() - self._last_render) * 1000
+            delay = max(1, int(FRAME_INTERVAL_MS - elapsed))
+            self._render_timer_id = iren.CreateOneShotTimer(delay)
+
+    def _on_render_timer(self, caller, event):
+        if caller.GetTimerEventId() != self._render_timer_id:
+            return
+        # Deferred handlers run first; their render requests join this tick
+        self._run_deferred()
+        self._render_timer_id = None
+        self._flush_render()
+
+    def _defer(self, key, handler):
+        """Run `handler` on the next tick, before rendering.
+
+        A newer request under the same key replaces a pending one (latest
+        wins), so a burst of drag or key-repeat events is applied once per
+        frame. Replaced requests are counted in coalesced_events and shown
+        on the animation label.
+        """
+        if key in self._deferred:
+            self.coalesced_events[key] += 1
+        self._deferred[key] = handler
+        self.request_render(())
+        if self._render_timer_id is None:
+            # Event loop not running yet: nothing to coalesce with
+            self._run_deferred()
+
+    def _run_deferred(self):
+        pending, self._deferred = self._deferred, {}
+        for handler in pending.values():
+            handler()
+
+    def _on_window_rendered(self, caller, event):
+        self._dirty_views.clear()
+        self._last_render = time.perf_counter()
+
+    def _coalesced_summary(self):
+        return ", ".join(f"{k}={n}" for k, n in sorted(self.coalesced_events.items()))
+
+    def _flush_render(self):
+        """Render the window once, drawing only the dirty views."""
+        if not self._dirty_views:
+            return
+        renderers = self.plotter.renderers
+        partial = len(self._dirty_views) < len(ALL_VIEWS)
+        if partial:
+            # Clean views keep last frame's pixels
+            for view in ALL_VIEWS:
+                renderers[view[0] * 2 + view[1]].SetDraw(view in self._dirty_views)
+        try:
+            self.plotter.render()
+        finally:
+            self._dirty_views.clear()
+            if partial:
+                for view in ALL_VIEWS:
+                    renderers[view[0] * 2 + view[1]].DrawOn()
 
     # --- Keybindings ---
 
@@ -1107,6 +2358,8 @@ class M2Viewer:
         # Our handler fires first on KeyPressEvent and sets _key_handled.
         # It also clears the key sym so VTK's downstream handlers see nothing.
         iren.AddObserver('KeyPressEvent', self._on_key_press)
+        # Animation playback ticks (timer is created on Space)
+        iren.AddObserver('TimerEvent', self._on_play_timer)
         # Block VTK's OnChar (handles printable keys like W=wireframe)
         style = iren.GetInteractorStyle()
         style.AddObserver('CharEvent', self._on_char)
@@ -1148,6 +2401,10 @@ class M2Viewer:
             self.cycle_animation()
         elif key.lower() == 'p' and not ctrl:
             self.toggle_anim_preview()
+        elif key.lower() == 'k' and not ctrl:
+            self.toggle_anim_bake()
+        elif key == 'space':
+            self.toggle_anim_play()
         elif key == 'Right':
             self.anim_step_forward()
         elif key == 'Left':
@@ -1186,7 +2443,7 @@ class M2Viewer:
                 'up': cam.GetViewUp(),
             }
             # Restore widgets if there's an active selection
-            if self.selected:
+            if self.selection:
                 self._update_widgets()
         else:
             # Unlock Free view camera for rotation
@@ -1196,7 +2453,7 @@ class M2Viewer:
                 self.plotter.clear_sphere_widgets()
                 self.widgets.clear()
         self._update_mode_label()
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
     def _update_mode_label(self):
         mode = "SELECT" if self.selection_mode else "CAMERA"
@@ -1251,8 +2508,9 @@ class M2Viewer:
         # finalize it now — "click to end the box".
         if self._box_dragging and self._box_start is not None:
             sx, sy = self._box_start
-            renderer = self._box_renderer
+            renderer, view = self._box_renderer, self._box_view
             self._reset_box_state()
+            self.request_render([view])  # rubber band removed
             self._in_pick = True
             try:
                 self._box_select(renderer, sx, sy, x, y, shift)
@@ -1293,7 +2551,7 @@ class M2Viewer:
         x, y = caller.GetEventPosition()
         sx, sy = self._box_start
         self._draw_rubber_band(self._box_renderer, sx, sy, x, y)
-        self.plotter.render()
+        self.request_render([self._box_view])
 
     def _on_left_up(self, caller, event):
         if not self.selection_mode or self._box_start is None or self._in_pick:
@@ -1301,10 +2559,12 @@ class M2Viewer:
 
         x, y = caller.GetEventPosition()
         sx, sy = self._box_start
-        renderer = self._box_renderer
+        renderer, view = self._box_renderer, self._box_view
         was_dragging = self._box_dragging
 
         self._reset_box_state()
+        if was_dragging:
+            self.request_render([view])  # rubber band removed
 
         if self._widget_dragging:
             return
@@ -1321,7 +2581,7 @@ class M2Viewer:
             self._in_pick = False
 
     def _on_right_down(self, caller, event):
-        if not self.selection_mode or not self.selected:
+        if not self.selection_mode or not self.selection:
             return
         x, y = caller.GetEventPosition()
         view, renderer = self._renderer_at_pos(x, y)
@@ -1371,16 +2631,6 @@ class M2Viewer:
 
     # --- Selection methods ---
 
-    def _get_visible_verts(self):
-        visible = set()
-        tri = self.m2.skin.tri_indices
-        for sm in self.m2.skin.submeshes:
-            key = (sm.group, sm.variant)
-            if self.gv_visible.get(key, False):
-                for j in range(sm.index_start, sm.index_start + sm.index_count):
-                    visible.add(tri[j])
-        return visible
-
     def _point_pick(self, renderer, x, y, shift):
         """Pick nearest vertex to the click position."""
         picker = vtk.vtkCellPicker()
@@ -1390,20 +2640,15 @@ class M2Viewer:
         if pos == (0, 0, 0) and picker.GetCellId() < 0:
             return
 
-        visible = self._get_visible_verts()
+        visible = self.visible_mask
         click = np.array(pos)
-        display = self._display_points()
-        dists = np.linalg.norm(display - click, axis=1)
-        mask = np.full(len(self.points), np.inf)
-        for vi in visible:
-            mask[vi] = dists[vi]
-
-        nearest = int(np.argmin(mask))
-        if mask[nearest] > 0.5:
+        index = self._pick_index()
+        nearest, _ = index.nearest(click, PICK_MAX_DISTANCE, visible)
+        if nearest is None:
             return
 
         new_pick = [nearest]
-        nearby = np.where(mask < SELECTION_RADIUS)[0]
+        nearby = index.query_radius(click, SELECTION_RADIUS, visible)
         if len(nearby) > 1:
             new_pick = nearby.tolist()
 
@@ -1411,46 +2656,59 @@ class M2Viewer:
 
     def _box_select(self, renderer, x0, y0, x1, y1, shift):
         """Select all visible vertices whose screen projection falls within the box."""
-        visible = self._get_visible_verts()
-        if not visible:
+        vis = np.flatnonzero(self.visible_mask)
+        if not len(vis):
             return
 
         # Normalize box bounds
         bx0, bx1 = min(x0, x1), max(x0, x1)
         by0, by1 = min(y0, y1), max(y0, y1)
 
-        display = self._display_points()
-        new_pick = []
-        for vi in visible:
-            pt = display[vi]
-            renderer.SetWorldPoint(float(pt[0]), float(pt[1]), float(pt[2]), 1.0)
-            renderer.WorldToDisplay()
-            dx, dy, _ = renderer.GetDisplayPoint()
-            if bx0 <= dx <= bx1 and by0 <= dy <= by1:
-                new_pick.append(vi)
+        screen = self._world_to_display(renderer, self._display_points()[vis])
+        inside = ((screen[:, 0] >= bx0) & (screen[:, 0] <= bx1) &
+                  (screen[:, 1] >= by0) & (screen[:, 1] <= by1))
+        new_pick = vis[inside].tolist()
 
         if new_pick:
             self._apply_pick(new_pick, shift)
 
+    @staticmethod
+    def _world_to_display(renderer, pts):
+        """Project (N, 3) world points to display (x, y) in one pass.
+
+        Same math as renderer.WorldToDisplay(): the camera's composite
+        projection for the tiled aspect ratio, perspective divide, then the
+        viewport mapping into window pixels.
+        """
+        cam = renderer.GetActiveCamera()
+        vm = cam.GetCompositeProjectionTransformMatrix(
+            renderer.GetTiledAspectRatio(), 0, 1)
+        mat = np.array([[vm.GetElement(r, c) for c in range(4)]
+                        for r in range(4)])
+        pts = np.asarray(pts, dtype=np.float64)
+        view = pts @ mat[:3, :3].T + mat[:3, 3]
+        w = pts @ mat[3, :3] + mat[3, 3]
+        w = np.where(w != 0.0, w, 1.0)
+        view = view[:, :2] / w[:, None]
+
+        sx, sy = renderer.GetRenderWindow().GetSize()
+        vp = renderer.GetViewport()
+        dx = (view[:, 0] + 1.0) * (sx * (vp[2] - vp[0])) / 2.0 + sx * vp[0]
+        dy = (view[:, 1] + 1.0) * (sy * (vp[3] - vp[1])) / 2.0 + sy * vp[1]
+        return np.column_stack([dx, dy])
+
     def _apply_pick(self, new_pick, shift):
         """Apply a pick result to the selection (with shift-add support)."""
-        self.selection_undo.append(self._capture_selection())
-        self.selection_redo.clear()
-
-        if shift and self.selected:
-            existing = set(self.selected)
-            for i in new_pick:
-                if i not in existing:
-                    self.selected.append(i)
+        before = self.selection.indices
+        if shift:
+            self.selection.add(new_pick)
         else:
-            self.selected = new_pick
-
-        for i in self.selected:
-            if i not in self.original_positions:
-                self.original_positions[i] = list(self.m2.vertices[i].pos)
+            self.selection.set(new_pick)
+        self._record_selection(before)
 
         self._update_selection_display()
         self._update_widgets()
+        self.request_render(ALL_VIEWS)
 
     def _deselect_at(self, renderer, x, y):
         """Right-click: remove the vertex nearest to click from selection."""
@@ -1462,49 +2720,36 @@ class M2Viewer:
             return
 
         click = np.array(pos)
-        display = self._display_points()
-        sel_set = set(self.selected)
-        best_idx = None
-        best_dist = float('inf')
-        for vi in sel_set:
-            d = np.linalg.norm(display[vi] - click)
-            if d < best_dist:
-                best_dist = d
-                best_idx = vi
-        if best_idx is None or best_dist > 0.5:
+        index = self._pick_index()
+        sel_mask = self.selection.mask
+        best_idx, _ = index.nearest(click, PICK_MAX_DISTANCE, sel_mask)
+        if best_idx is None:
             return
 
         # Also deselect nearby vertices (same radius as selection)
-        to_remove = {best_idx}
-        for vi in sel_set:
-            if np.linalg.norm(display[vi] - display[best_idx]) < DESELECTION_RADIUS:
-                to_remove.add(vi)
-
-        self.selection_undo.append(self._capture_selection())
-        self.selection_redo.clear()
-        self.selected = [i for i in self.selected if i not in to_remove]
+        nearby = index.query_radius(index.points[best_idx],
+                                    DESELECTION_RADIUS, sel_mask)
+
+        before = self.selection.indices
+        self.selection.remove(np.append(nearby, best_idx))
+        self._record_selection(before)
         self._update_selection_display()
-        if self.selected:
+        if self.selection:
             self._update_widgets()
         else:
             if self.widgets:
                 self.plotter.clear_sphere_widgets()
                 self.widgets.clear()
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
     def scale_selection(self, factor):
         """Scale selected vertices from their centroid by the given factor."""
-        if not self.selected or not self.selection_mode:
+        if not self.selection or not self.selection_mode:
             return
-        self.motion_undo.append(self._capture_positions())
-        self.motion_redo.clear()
-
-        center = self.points[self.selected].mean(axis=0)
-        for i in self.selected:
-            v = self.m2.vertices[i]
-            v.pos[0] = center[0] + (v.pos[0] - center[0]) * factor
-            v.pos[1] = center[1] + (v.pos[1] - center[1]) * factor
-            v.pos[2] = center[2] + (v.pos[2] - center[2]) * factor
+        idx = self.selection.indices
+        sel_pts = self.points[idx]
+        center = sel_pts.mean(axis=0)
+        self._edit_positions(idx, center + (sel_pts - center) * factor)
 
         self.update_mesh_points()
         self._update_selection_display()
@@ -1513,68 +2758,60 @@ class M2Viewer:
 
     # --- Mirror tool ---
 
-    def _build_mirror_map(self):
-        """Pre-compute vertex mirror pairs from the original mesh positions.
+    def _get_mirror_map(self):
+        """Per-vertex mirror counterpart index (-1 for none), from the
+        load-time mesh.
 
-        For each vertex, find the closest vertex to its Y-flipped position.
-        Returns dict mapping vertex index -> its mirror counterpart index.
+        Read from the `<model>.m2.mirror.npz` sidecar when its content hash
+        matches, otherwise computed and written there. The cache is skipped
+        once the model file has changed since it was loaded.
         """
-        pts = self.points  # original positions at load time
-        mirrored = pts.copy()
-        mirrored[:, 1] *= -1
-
-        mirror_map = {}
-        for i in range(len(pts)):
-            dists = np.sum((pts - mirrored[i]) ** 2, axis=1)
-            j = int(np.argmin(dists))
-            if dists[j] < 0.05 * 0.05 and j != i:
-                mirror_map[i] = j
-        return mirror_map
+        if self._mirror_map is None:
+            cache_path = f"{self.m2.path}.mirror.npz"
+            digest = None
+            if _file_stamp(self.m2.path) == self._mirror_stamp:
+                digest = _file_digest(self.m2.path)
+            cached = load_mirror_cache(cache_path, digest)
+            if cached is None:
+                src, dst = build_mirror_map(self.store.rest)
+                save_mirror_cache(cache_path, digest, src, dst)
+            else:
+                src, dst = cached
+            self._mirror_map = np.full(len(self.points), -1, dtype=np.intp)
+            self._mirror_map[src] = dst
+        return self._mirror_map
 
     def mirror_selection(self):
         """Mirror selected vertices onto their Y-axis counterparts."""
-        if not self.selected or not self.selection_mode:
+        if not self.selection or not self.selection_mode:
             return
 
-        # Find counterparts for selected vertices
-        pairs = []  # (source, dest)
-        sel_set = set(self.selected)
-        for vi in self.selected:
-            ci = self._mirror_map.get(vi)
-            if ci is not None and ci not in sel_set:
-                pairs.append((vi, ci))
+        # Counterparts of selected vertices that lie outside the selection
+        src = self.selection.indices
+        dst = self._get_mirror_map()[src]
+        keep = dst >= 0
+        keep[keep] = ~self.selection.mask[dst[keep]]
+        src, dst = src[keep], dst[keep]
+        n_pairs = len(src)
 
-        if not pairs:
+        if not n_pairs:
             print("No mirror counterparts found outside the selection.")
             return
 
-        # Track originals for undo
-        for _, dst in pairs:
-            if dst not in self.original_positions:
-                self.original_positions[dst] = list(self.m2.vertices[dst].pos)
-        self.motion_undo.append(self._capture_positions())
-        self.motion_redo.clear()
+        # A counterpart shared by several sources takes the last source
+        _, last = np.unique(dst[::-1], return_index=True)
+        last = len(dst) - 1 - last
+        src, dst = src[last], dst[last]
 
         # Apply: set each counterpart to the Y-flipped position of the source
-        moved = []
-        for src_vi, dst_vi in pairs:
-            src_pos = self.m2.vertices[src_vi].pos
-            mirrored = [src_pos[0], -src_pos[1], src_pos[2]]
-            self.m2.vertices[dst_vi].pos[:] = mirrored
-            self.points[dst_vi] = mirrored
-            moved.append(dst_vi)
+        self._edit_positions(dst, self.points[src] * np.array([1, -1, 1], dtype=np.float32))
 
         # Update meshes
-        moved_arr = np.array(moved)
-        for view in ALL_VIEWS:
-            for key, mesh in self.view_meshes[view].items():
-                if mesh is not None:
-                    mesh.points[moved_arr] = self.points[moved_arr]
-                    mesh.Modified()
+        self._show_points(self.points[dst], dst)
 
         self._update_selection_display()
-        self.plotter.render()
-        print(f"Mirrored {len(pairs)} vertices across Y=0.")
+        self.request_render(ALL_VIEWS)
+        print(f"Mirrored {n_pairs} vertices across Y=0.")
 
     # --- Animation preview ---
 
@@ -1584,9 +2821,10 @@ class M2Viewer:
         if self.anim_preview:
             self._apply_anim_frame()
         else:
+            self._stop_playback()
             self._restore_rest_pose()
         self._update_anim_label()
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
     def cycle_animation(self):
         """Cycle to the next animation (A key)."""
@@ -1594,58 +2832,190 @@ class M2Viewer:
             return
         self.anim_index = (self.anim_index + 1) % len(self.m2.animations)
         self.anim_time_ms = 0
-        if self.anim_preview:
-            self._apply_anim_frame()
-        self._update_anim_label()
-        self.plotter.render()
+        self._show_anim_time()
 
     def anim_step_forward(self):
         """Step animation forward by one frame (Right arrow)."""
+        self._step_anim_time(1)
+
+    def anim_step_backward(self):
+        """Step animation backward by one frame (Left arrow)."""
+        self._step_anim_time(-1)
+
+    def _step_anim_time(self, direction):
         if not self.m2.animations:
             return
         anim = self.m2.animations[self.anim_index]
-        self.anim_time_ms = (self.anim_time_ms + self.anim_step_ms) % max(anim.duration, 1)
+        dur = max(anim.duration, 1)
+        step = self.anim_step_ms
+        if self.anim_bake:
+            # Move between baked frames (wrapping to the last one, not to
+            # duration - step) so every step is a cache lookup
+            n_frames = -(-dur // step)
+            frame = (self.anim_time_ms // step + direction) % n_frames
+            self.anim_time_ms = frame * step
+        else:
+            self.anim_time_ms = (self.anim_time_ms + direction * step) % dur
+        self._show_anim_time()
+
+    def _show_anim_time(self):
+        """Pose and label the current animation time on the next tick.
+
+        Stepping only moves anim_time_ms; held arrow keys then re-skin once
+        per frame instead of once per auto-repeat.
+        """
+        self._anchor_playback()
+        self._defer('anim_frame', self._refresh_anim_frame)
+
+    def _refresh_anim_frame(self):
         if self.anim_preview:
             self._apply_anim_frame()
         self._update_anim_label()
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
-    def anim_step_backward(self):
-        """Step animation backward by one frame (Left arrow)."""
+    def toggle_anim_play(self):
+        """Play/pause the current animation in real time (Space)."""
         if not self.m2.animations:
             return
+        if self.anim_playing:
+            self._stop_playback()
+        else:
+            if not self.anim_preview:
+                self.anim_preview = True
+                self._apply_anim_frame()
+            self.anim_playing = True
+            self._play_fps = 0.0
+            self._play_skipped = 0
+            self._anchor_playback()
+            iren = self.plotter.iren.interactor
+            self._play_timer_id = iren.CreateRepeatingTimer(self.anim_step_ms)
+        self._update_anim_label()
+        self.request_render(ALL_VIEWS)
+
+    def _stop_playback(self):
+        if not self.anim_playing:
+            return
+        self.anim_playing = False
+        if self._play_timer_id is not None:
+            self.plotter.iren.interactor.DestroyTimer(self._play_timer_id)
+            self._play_timer_id = None
+
+    def _anchor_playback(self):
+        """Restart the wall-clock mapping from the current animation time."""
+        now = time.perf_counter()
+        self._play_origin = (now, self.anim_time_ms)
+        self._play_last = now
+
+    def _on_play_timer(self, caller, event):
+        """Advance playback to the wall-clock time and show that frame.
+
+        Ticks that arrive less than half a frame after the last shown frame
+        (queued up behind a slow frame) are dropped. Animation time always
+        follows the wall clock, so a slow model skips frames rather than
+        playing back in slow motion.
+        """
+        if not self.anim_playing or caller.GetTimerEventId() != self._play_timer_id:
+            return
+        now = time.perf_counter()
+        since_last = (now - self._play_last) * 1000
+        if since_last < self.anim_step_ms * 0.5:
+            return
         anim = self.m2.animations[self.anim_index]
-        dur = max(anim.duration, 1)
-        self.anim_time_ms = (self.anim_time_ms - self.anim_step_ms) % dur
-        if self.anim_preview:
-            self._apply_anim_frame()
+        start, start_ms = self._play_origin
+        t = int(start_ms + (now - start) * 1000) % max(anim.duration, 1)
+        if self.anim_bake:
+            # Snap to the bake grid so every frame is a cache lookup
+            t -= t % self.anim_step_ms
+        self._play_skipped += max(0, int(since_last // self.anim_step_ms) - 1)
+        self.anim_time_ms = t
+
+        t0 = time.perf_counter()
+        self._apply_anim_frame()
+        t1 = time.perf_counter()
         self._update_anim_label()
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
+        self._flush_render()
+        t2 = time.perf_counter()
+
+        fps = 1000.0 / since_last
+        self._play_fps = fps if not self._play_fps else 0.9 * self._play_fps + 0.1 * fps
+        self._play_skin_ms = (t1 - t0) * 1000
+        self._play_render_ms = (t2 - t1) * 1000
+        self._play_last = now
 
     def _apply_anim_frame(self):
         """Compute deformed positions and update all meshes."""
-        deformed = compute_deformed_positions(self.m2, self.anim_index,
-                                              self.anim_time_ms)
-        deformed = deformed.astype(np.float32)
+        self._bone_matrices, deformed = self._pose_frame()
         self._deformed_points = deformed
-        for view in ALL_VIEWS:
-            for key, mesh in self.view_meshes[view].items():
-                if mesh is not None:
-                    mesh.points[:] = deformed
-                    mesh.Modified()
+        self._show_points(deformed)
         # Update selection display if active
-        if self.selected:
+        if self.selection:
+            self._update_selection_display()
+
+    def _pose_frame(self):
+        """Bone matrices and deformed positions for the current frame.
+
+        Served from the bake cache when bake mode is on and the frame lies on
+        the clip's sampling grid.
+        """
+        if self.anim_bake:
+            key = (self.anim_index, self.anim_step_ms)
+            clip = self._clip_cache.get(key)
+            cached = clip is not None
+            if not cached:
+                clip = bake_clip(self.m2, self.anim_index, self.anim_step_ms,
+                                 self._pose,
+                                 self._skin if self.bake_positions else None)
+                self._clip_cache.put(key, clip)
+            frame = clip.frame_index(self.anim_time_ms)
+            self._clip_cache.record(cached and frame is not None)
+            if frame is not None:
+                if clip.positions is None and self.bake_positions:
+                    # Positions were discarded after an edit; re-skin the clip
+                    clip.skin(self._skin)
+                    self._clip_cache.evict()
+                mats = clip.frame_matrices(frame)
+                if clip.positions is not None:
+                    # Copy: incremental re-skins patch the displayed buffer
+                    return mats, clip.positions[frame].copy()
+                return mats, self._skin.deform(mats).astype(np.float32)
+        mats = compute_bone_matrices(self.m2, self.anim_index,
+                                     self.anim_time_ms, self._pose)
+        return mats, self._skin.deform(mats).astype(np.float32)
+
+    def _reskin_vertices(self, indices):
+        """Re-skin only the given vertices against the current frame's bones.
+
+        Used after weight edits: the pose is unchanged, so only the edited
+        vertices need new deformed positions.
+        """
+        if not self.anim_preview:
+            return
+        if self._bone_matrices is None or self._deformed_points is None:
+            self._apply_anim_frame()
+            return
+        idx = np.asarray(sorted(indices), dtype=np.intp)
+        if len(idx) == 0:
+            return
+        self._deformed_points[idx] = self._skin.deform(self._bone_matrices, idx)
+        self._show_points(self._deformed_points[idx], idx)
+        if self.selection:
             self._update_selection_display()
 
+    def toggle_anim_bake(self):
+        """Toggle baking whole clips into the LRU clip cache (K key)."""
+        self.anim_bake = not self.anim_bake
+        if not self.anim_bake:
+            self._clip_cache.clear()
+        self._update_anim_label()
+        self.request_render(ALL_VIEWS)
+
     def _restore_rest_pose(self):
         """Restore base vertex positions in all meshes."""
         self._deformed_points = None
-        for view in ALL_VIEWS:
-            for key, mesh in self.view_meshes[view].items():
-                if mesh is not None:
-                    mesh.points[:] = self.points
-                    mesh.Modified()
-        if self.selected:
+        self._bone_matrices = None
+        self._show_points(self.points)
+        if self.selection:
             self._update_selection_display()
 
     def _update_anim_label(self):
@@ -1657,6 +3027,18 @@ class M2Viewer:
         text = (f"[A] Anim: {anim.name} ({self.anim_index}/{len(self.m2.animations)})  "
                 f"[</>] {self.anim_time_ms}ms/{anim.duration}ms  "
                 f"[P] Preview: {state}")
+        if self.anim_bake:
+            cache = self._clip_cache
+            text += (f"  [K] Bake: {len(cache)} clips "
+                     f"{cache.nbytes / (1024 * 1024):.1f}MB "
+                     f"hit {cache.hits}/miss {cache.misses}")
+        if self.anim_playing:
+            text += (f"  [Space] {self._play_fps:.1f}fps "
+                     f"skin {self._play_skin_ms:.1f}ms "
+                     f"render {self._play_render_ms:.1f}ms "
+                     f"skipped {self._play_skipped}")
+        if self.coalesced_events:
+            text += f"  coalesced {self._coalesced_summary()}"
         for view in ALL_VIEWS:
             self.plotter.subplot(*view)
             self.plotter.add_text(
@@ -1675,7 +3057,7 @@ class M2Viewer:
         else:
             self._clear_bone_colors()
         self._update_bone_label()
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
     def next_bone(self):
         """Select next bone for visualization (Up arrow in bone mode)."""
@@ -1683,9 +3065,9 @@ class M2Viewer:
             return
         self.bone_vis_index = (self.bone_vis_index + 1) % len(self.m2.bones)
         if self.bone_vis_mode:
-            self._apply_bone_colors()
+            self._refresh_bone_colors()
         self._update_bone_label()
-        self.plotter.render()
+        self.request_render(ALL_VIEWS)
 
     def prev_bone(self):
         """Select previous bone for visualization (Down arrow in bone mode)."""
@@ -1693,63 +3075,96 @@ class M2Viewer:
             return
         self.bone_vis_index = (self.bone_vis_index - 1) % len(self.m2.bones)
         if self.bone_vis_mode:
-            self._apply_bone_colors()
+            self._refresh_bone_colors()
         self._update_bone_label()
-        self.plotter.render()
-
-    def _compute_bone_weights_array(self, bone_index):
-        """Get per-vertex weight for a specific bone as float array (0..1)."""
-        n = len(self.m2.vertices)
-        weights = np.zeros(n, dtype=np.float32)
-        for i, v in enumerate(self.m2.vertices):
-            for j in range(4):
-                if v.bone_indices[j] == bone_index and v.bone_weights[j] > 0:
-                    weights[i] = v.bone_weights[j] / 255.0
-        return weights
+        self.request_render(ALL_VIEWS)
 
     def _apply_bone_colors(self):
         """Color all meshes by weight for the selected bone (red=1, blue=0).
 
-        Rebuilds actors with scalar coloring. Use _refresh_bone_colors() for
-        lightweight updates after weight edits.
+        Updates the shared bone_weight scalars and switches every actor's
+        mapper to color by them. Use _refresh_bone_colors() for lightweight
+        updates after weight edits or bone switches.
         """
-        weights = self._compute_bone_weights_array(self.bone_vis_index)
-        for view in ALL_VIEWS:
-            for key, mesh in self.view_meshes[view].items():
-                if mesh is not None:
-                    mesh['bone_weight'] = weights
-                    mesh.set_active_scalars('bone_weight')
-            # Remove existing actor and re-add with scalar coloring
-            for key in list(self.view_actors[view].keys()):
-                actor = self.view_actors[view].get(key)
-                if actor is not None:
-                    self.plotter.subplot(*view)
-                    self.plotter.remove_actor(actor)
-                    mesh = self.view_meshes[view][key]
-                    if mesh is not None:
-                        actor = self.plotter.add_mesh(
-                            mesh, scalars='bone_weight', cmap='coolwarm',
-                            clim=[0, 1], show_edges=True, edge_color="gray",
-                            show_scalar_bar=False,
-                            name=f"gv_{key[0]}_{key[1]}_{key[2]}_{view[0]}{view[1]}",
-                        )
-                        self.view_actors[view][key] = actor
+        self._refresh_bone_colors()
+        for rk in self.view_actors[FREE]:
+            self._set_bone_coloring(rk, True)
 
     def _refresh_bone_colors(self):
-        """Lightweight update of bone weight scalars on existing meshes."""
-        weights = self._compute_bone_weights_array(self.bone_vis_index)
-        for view in ALL_VIEWS:
-            for key, mesh in self.view_meshes[view].items():
-                if mesh is not None:
-                    mesh['bone_weight'] = weights
-                    mesh.Modified()
+        """Point the shared bone_weight scalars at the selected bone.
+
+        Switching bones rewrites only the vertices the old and new bone
+        influence. The scalars always hold the shown bone's current weights
+        (see _update_bone_scalars), so the old bone's index entries are
+        exactly its non-zero scalars.
+        """
+        bone = self.bone_vis_index
+        geometry = self.geometry
+        if 'bone_weight' not in geometry.scalars:
+            weights = np.zeros(len(self.store), dtype=np.float32)
+            verts, w = self._bone_index.influence(bone)
+            weights[verts] = w
+            geometry.set_point_scalars('bone_weight', weights)
+        elif bone != self._bone_shown:
+            verts, _ = self._bone_index.influence(self._bone_shown)
+            geometry.set_point_scalars('bone_weight', 0.0, verts)
+            verts, w = self._bone_index.influence(bone)
+            geometry.set_point_scalars('bone_weight', w, verts)
+        self._bone_shown = bone
+        self._check_bone_scalars()
+
+    def _update_bone_scalars(self, indices):
+        """Rewrite the bone_weight scalars of vertices whose weights changed.
+
+        Runs on every weight edit, whether or not bone colors are showing,
+        so the scalars never go stale for the bone they hold.
+        """
+        if self._bone_shown is None:
+            return
+        self.geometry.set_point_scalars(
+            'bone_weight',
+            bone_weight_column(self.store.bone_indices[indices],
+                               self.store.bone_weights[indices],
+                               self._bone_shown),
+            np.asarray(indices, dtype=np.intp))
+        self._check_bone_scalars()
+
+    def _check_bone_scalars(self):
+        """Compare the incremental scalars with a full recompute
+        (only with CHECK_INCREMENTAL)."""
+        if not CHECK_INCREMENTAL:
+            return
+        expected = bone_weight_column(self.store.bone_indices,
+                                      self.store.bone_weights, self._bone_shown)
+        buf, _ = self.geometry.scalars['bone_weight']
+        bad = np.flatnonzero(buf != expected)
+        assert not len(bad), (
+            f"bone_weight scalars for bone {self._bone_shown} are stale "
+            f"at {len(bad)} vertices, e.g. {bad[:5].tolist()}")
 
     def _clear_bone_colors(self):
         """Restore normal mesh appearance (remove bone weight coloring)."""
-        for gv in list(self.gv_render_keys.keys()):
-            if self.gv_visible.get(gv, False):
-                self._remove_mesh_all_views(gv)
-                self._add_mesh_all_views(gv)
+        for rk in self.view_actors[FREE]:
+            self._set_bone_coloring(rk, False)
+
+    def _set_bone_coloring(self, rk, enabled):
+        """Switch a render key's shared mapper between bone-weight scalars
+        and its normal texture/color."""
+        mapper = self.view_actors[FREE][rk].GetMapper()
+        if enabled:
+            if self._bone_lut is None:
+                self._bone_lut = pv.LookupTable(cmap='coolwarm',
+                                                scalar_range=(0, 1))
+            mapper.SetLookupTable(self._bone_lut)
+            mapper.SetScalarModeToUsePointFieldData()
+            mapper.SelectColorArray('bone_weight')
+            mapper.SetScalarRange(0, 1)
+            mapper.ScalarVisibilityOn()
+        else:
+            mapper.ScalarVisibilityOff()
+        texture = None if enabled else self.pv_textures.get(rk[2])
+        for view in ALL_VIEWS:
+            self.view_actors[view][rk].SetTexture(texture)
 
     def edit_bone_weight(self, increase=True):
         """Adjust bone weight on selected vertices for the current bone (W/Shift+W).
@@ -1757,91 +3172,32 @@ class M2Viewer:
         Increases or decreases the weight for bone_vis_index on all selected
         vertices. Other weights are scaled proportionally to maintain sum=255.
         """
-        if not self.selected:
+        if not self.selection:
             print("No vertices selected for weight editing.")
             return
 
         bi = self.bone_vis_index
         delta = self.weight_edit_delta if increase else -self.weight_edit_delta
 
-        # Snapshot weights before editing for undo
-        before = self._capture_weights(self.selected)
-        changed_indices = set()
-
-        for vi in self.selected:
-            v = self.m2.vertices[vi]
-
-            # Find if this bone already has a slot
-            slot = -1
-            for j in range(4):
-                if v.bone_indices[j] == bi:
-                    slot = j
-                    break
-
-            if slot == -1 and increase:
-                # Need a free slot or replace the smallest weight
-                # Find the slot with smallest weight
-                min_j, min_w = 0, v.bone_weights[0]
-                for j in range(1, 4):
-                    if v.bone_weights[j] < min_w:
-                        min_j, min_w = j, v.bone_weights[j]
-                slot = min_j
-                v.bone_indices[slot] = bi
-                v.bone_weights[slot] = 0
-            elif slot == -1:
-                # Decreasing a bone that isn't assigned — skip
-                continue
-
-            # Adjust weight
-            old_w = v.bone_weights[slot]
-            new_w = max(0, min(255, old_w + delta))
+        selected = self.selection.indices
+        rows, new_weights, new_bones = adjust_bone_weights(
+            self.store.bone_weights[selected], self.store.bone_indices[selected],
+            bi, delta)
+        if not len(rows):
+            return
 
-            if new_w == old_w:
-                continue
+        changed = selected[rows]
+        before = (self.store.bone_weights[changed], self.store.bone_indices[changed])
+        self._set_weights(changed, new_weights, new_bones)
+        self.journal.record('weights', changed, before,
+                            (self.store.bone_weights[changed],
+                             self.store.bone_indices[changed]))
+        self._reskin_vertices(changed)
+        self.request_render(ALL_VIEWS)
 
-            # Can't decrease if no other bones to absorb the weight
-            other_sum = sum(v.bone_weights[j] for j in range(4) if j != slot)
-            if other_sum == 0 and not increase:
-                continue
-
-            v.bone_weights[slot] = new_w
-            changed_indices.add(vi)
-
-            # Normalize: distribute remaining weight among other bones
-            remaining = 255 - new_w
-            if other_sum > 0:
-                scale = remaining / other_sum
-                for j in range(4):
-                    if j != slot:
-                        v.bone_weights[j] = int(round(v.bone_weights[j] * scale))
-
-            # Fix rounding to ensure sum = 255 — apply to largest weight,
-            # not the edited slot, to avoid oscillation at small values
-            total = sum(v.bone_weights)
-            diff = 255 - total
-            if diff != 0:
-                fix_slot = max(range(4), key=lambda j: v.bone_weights[j])
-                v.bone_weights[fix_slot] = max(0, v.bone_weights[fix_slot] + diff)
-
-            # Remove zero-weight bones (set their index to 0)
-            for j in range(4):
-                if v.bone_weights[j] == 0 and j != slot:
-                    v.bone_indices[j] = 0
-
-        if changed_indices:
-            after = self._capture_weights(changed_indices)
-            # Only store before-state for vertices that actually changed
-            before_changed = {vi: before[vi] for vi in changed_indices}
-            self.weight_undo.append((before_changed, after))
-            self.weight_redo.clear()
-            if self.bone_vis_mode:
-                self._refresh_bone_colors()
-            if self.anim_preview:
-                self._apply_anim_frame()
-            self.plotter.render()
-            for vi in changed_indices:
-                v = self.m2.vertices[vi]
-                print(f"  v{vi}: weights={list(v.bone_weights)} bones={list(v.bone_indices)}")
+        bone_w = np.where(new_bones == bi, new_weights, 0).max(axis=1)
+        print(f"  bone {bi} {delta:+d}: {len(changed)}/{len(selected)} vertices, "
+              f"weight now {bone_w.min()}..{bone_w.max()} (mean {bone_w.mean():.0f})")
 
     def _update_bone_label(self):
         """Update bone visualization info text."""
@@ -1851,8 +3207,11 @@ class M2Viewer:
         state = "ON" if self.bone_vis_mode else "OFF"
         key_str = f"key={bone.key_bone_id}" if bone.key_bone_id >= 0 else "no key"
         parent_str = f"parent={bone.parent}" if bone.parent >= 0 else "root"
+        counts = self._bone_index.counts()
         text = (f"[B] Bone: {self.bone_vis_index}/{len(self.m2.bones)} "
-                f"({key_str}, {parent_str})  "
+                f"({key_str}, {parent_str}, "
+                f"{counts[self.bone_vis_index]} verts; "
+                f"{np.count_nonzero(counts)} bones skin)  "
                 f"[Up/Down] Select  [W/^W] Edit  Vis: {state}")
         for view in ALL_VIEWS:
             self.plotter.subplot(*view)
@@ -1862,27 +3221,28 @@ class M2Viewer:
                 name=f"bonelabel_{view[0]}{view[1]}",
             )
 
+    def _set_positions(self, indices, values):
+        """Move vertices to new rest positions."""
+        self.points[indices] = values
+        self._clip_cache.discard_positions()
+
     def update_mesh_points(self):
-        """Update vertex positions in-place across all views."""
-        for i in self.selected:
-            self.points[i] = self.m2.vertices[i].pos
+        """Push the selected vertices' positions to all views."""
         # When animation preview is active, show deformed positions in the mesh
         # (self.points always tracks rest-pose for editing purposes)
+        idx = self.selection.indices
         display = self._display_points()
-        for view in ALL_VIEWS:
-            for key, mesh in self.view_meshes[view].items():
-                if mesh is not None:
-                    mesh.points[self.selected] = display[self.selected]
-                    mesh.Modified()
-        self.plotter.render()
+        self._show_points(display[idx], idx)
+        self.request_render(ALL_VIEWS)
 
     def _compute_widget_pos(self):
         """Compute a widget position offset outward from the mesh surface."""
-        sel_pts = self.points[self.selected]
+        idx = self.selection.indices
+        sel_pts = self.points[idx]
         center = sel_pts.mean(axis=0)
 
         # Average normal of selected vertices to push widget outward
-        normals = np.array([self.m2.vertices[i].normal for i in self.selected])
+        normals = self.store.normals[idx].astype(np.float64)
         avg_normal = normals.mean(axis=0)
         length = np.linalg.norm(avg_normal)
         if length > 1e-6:
@@ -1915,33 +3275,58 @@ class M2Viewer:
 
     def _make_widget_callback(self, source_view):
         def callback(new_center):
-            # Snapshot positions on first drag movement
+            # Every movement of one drag coalesces into a single undo step
             if not self._widget_dragging:
-                self.motion_undo.append(self._capture_positions())
-                self.motion_redo.clear()
+                self._drag_group = object()
             self._widget_dragging = True
-            if self._syncing_widgets or not self.selected:
+            if self._syncing_widgets or not self.selection:
                 return
-            self._syncing_widgets = True
-
-            # Delta from widget's own previous position, not vertex centroid,
-            # so the normal offset doesn't cause a jump on first drag.
-            delta = np.array(new_center) - self._widget_center
-            self._widget_center = np.array(new_center)
-            for i in self.selected:
-                self.m2.vertices[i].pos[0] += delta[0]
-                self.m2.vertices[i].pos[1] += delta[1]
-                self.m2.vertices[i].pos[2] += delta[2]
-            self.update_mesh_points()
-            self._update_selection_display()
+            # Mouse moves arrive faster than frames; apply the latest only
+            center = np.array(new_center)
+            self._defer('widget_drag',
+                        lambda: self._drag_selection(source_view, center))
+        return callback
 
-            # Sync widget positions in other views
-            for view, w in self.widgets.items():
-                if view != source_view and w is not None:
-                    w.SetCenter(new_center)
+    def _drag_selection(self, source_view, new_center):
+        """Move the selection with a widget dragged to `new_center`."""
+        if self._syncing_widgets or not self.selection:
+            return
+        self._syncing_widgets = True
+
+        # Delta from widget's own previous position, not vertex centroid,
+        # so the normal offset doesn't cause a jump on first drag.
+        delta = new_center - self._widget_center
+        self._widget_center = new_center
+        idx = self.selection.indices
+        self._edit_positions(idx, self.points[idx] + delta,
+                             group=self._drag_group)
+        self.update_mesh_points()
+        self._update_selection_display()
 
-            self._syncing_widgets = False
-        return callback
+        # Sync widget positions in other views
+        for view, w in self.widgets.items():
+            if view != source_view and w is not None:
+                w.SetCenter(new_center)
+
+        self._syncing_widgets = False
+
+    def _show_points(self, values, indices=None):
+        """Write displayed positions to the shared geometry (all, or just
+        `indices`) and keep the picking index in step."""
+        self.geometry.update(values, indices)
+        if self._pick_grid is None:
+            return
+        if indices is None:
+            # Whole pose changed: rebuild lazily on the next pick
+            self._pick_grid = None
+        else:
+            self._pick_grid.update(indices, self.geometry.points[indices])
+
+    def _pick_index(self):
+        """Spatial index over the displayed (rest or deformed) positions."""
+        if self._pick_grid is None:
+            self._pick_grid = PointGrid(self.geometry.points, SELECTION_RADIUS)
+        return self._pick_grid
 
     def _display_points(self):
         """Return the vertex positions currently shown (deformed or rest)."""
@@ -1950,32 +3335,42 @@ class M2Viewer:
         return self.points
 
     def _update_selection_display(self):
-        """Show red selection dots in all 4 views."""
-        display = self._display_points()
-        sel_pts = display[self.selected] if self.selected else None
+        """Show red selection dots in all 4 views.
+
+        The dots are vertex cells on the shared vertex buffer, so moves and
+        animation poses reach them without any work here; a selection change
+        only swaps the cells, and an empty selection hides the actors.
+        """
+        idx = self.selection.indices
+        if self.selection_cloud is None:
+            if not len(idx):
+                return
+            self._create_selection_actors()
+        if len(idx) and not np.array_equal(idx, self._selection_shown):
+            cells = np.empty((len(idx), 2), dtype=np.int64)
+            cells[:, 0] = 1
+            cells[:, 1] = idx
+            self.selection_cloud.verts = cells.ravel()
+            self._selection_shown = idx
+        for actor in self.selection_actors.values():
+            actor.SetVisibility(len(idx) > 0)
+
+    def _create_selection_actors(self):
+        self.selection_cloud = self.geometry.point_cloud()
+        first = None
         for view in ALL_VIEWS:
-            mesh = self.selection_meshes[view]
-            # If selection count changed, we must recreate
-            if mesh is not None and sel_pts is not None and len(mesh.points) == len(sel_pts):
-                mesh.points = sel_pts.copy()
-                mesh.Modified()
+            self.plotter.subplot(*view)
+            name = f"sel_{view[0]}{view[1]}"
+            if first is None:
+                actor = first = self.plotter.add_mesh(
+                    self.selection_cloud, color="red", point_size=12,
+                    render_points_as_spheres=True, name=name,
+                )
             else:
-                # Remove old actor if any
-                self.plotter.subplot(*view)
-                actor = self.selection_actors[view]
-                if actor is not None:
-                    self.plotter.remove_actor(actor)
-                    self.selection_actors[view] = None
-                    self.selection_meshes[view] = None
-                # Create new if we have a selection
-                if sel_pts is not None:
-                    sel_cloud = pv.PolyData(sel_pts.copy())
-                    self.selection_actors[view] = self.plotter.add_mesh(
-                        sel_cloud, color="red", point_size=12,
-                        render_points_as_spheres=True,
-                        name=f"sel_{view[0]}{view[1]}",
-                    )
-                    self.selection_meshes[view] = sel_cloud
+                actor = vtk.vtkActor()
+                actor.ShallowCopy(first)
+                self.plotter.add_actor(actor, name=name)
+            self.selection_actors[view] = actor
 
     def run(self):
         # Set up all 4 views with meshes and cameras
@@ -1991,7 +3386,7 @@ class M2Viewer:
         # Add initial meshes to all views
         for gv in sorted(self.gv_render_keys.keys()):
             if self.gv_visible[gv]:
-                self._add_mesh_all_views(gv)
+                self._update_gv(gv)
 
         # Set preset cameras for fixed views + Free starts matching Front
         for view, cam in CAMERAS.items():
@@ -2009,9 +3404,8 @@ class M2Viewer:
         for i, g in enumerate(self.groups):
             name = GEOSET_NAMES.get(g, f"Group {g}")
             n_variants = len(self.group_variants[g])
-            total_tri = sum(len(self.gv_faces[rk]) // 4
-                           for v in self.group_variants[g]
-                           for rk in self.gv_render_keys[(g, v)])
+            total_tri = sum(self.gv_tri_counts[(g, v)]
+                            for v in self.group_variants[g])
             y = 10 + i * ROW_H
 
             self.plotter.add_checkbox_button_widget(
@@ -2044,27 +3438,32 @@ class M2Viewer:
 
         # Starting in camera mode — Free view stays unlocked
 
-        # Keybindings (Ctrl+Z, Ctrl+S, Ctrl+Shift+S, G, A, P, arrows, B, W)
+        # Coalesced rendering (see request_render)
+        self._setup_render_scheduler()
+
+        # Keybindings (Ctrl+Z, Ctrl+S, Ctrl+Shift+S, G, A, P, K, Space, arrows, B, W)
         self._setup_keybindings()
         self._update_mode_label()
         self._update_anim_label()
         self._update_bone_label()
 
         self.plotter.show()
+        if self.coalesced_events:
+            print(f"Coalesced input events: {self._coalesced_summary()}")
+        self.store.sync_to_m2(self.m2)
         return self._get_changes()
 
     def _get_changes(self):
-        changes = []
-        for i, old_pos in self.original_positions.items():
-            new_pos = self.m2.vertices[i].pos
-            if old_pos != new_pos:
-                changes.append((i, old_pos, list(new_pos)))
-        return changes
+        moved = self.store.moved()
+        return list(zip(moved.tolist(), self.store.rest[moved].tolist(),
+                        self.points[moved].tolist()))
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python viewer.py <model.m2>")
+    args = [a for a in sys.argv[1:] if a != '--compact']
+    compact = len(args) != len(sys.argv) - 1
+    if not args:
+        print("Usage: python viewer.py [--compact] <model.m2>")
         print()
         print("Textures are resolved from BLP files next to the M2:")
         print("  Replaceable:  {ModelName}Skin00_XX.blp / _Extra.blp")
@@ -2073,17 +3472,23 @@ def main():
         print("Examples:")
         print("  python viewer.py TaurenFemale.m2")
         print("  python viewer.py Character/Tauren/Female/TaurenFemale.m2")
+        print()
+        print("--compact builds each geoset mesh from only the vertices it uses")
+        print("(less memory when many hair/facial variants are loaded).")
+        print()
+        print("Headless bake of every animation (no window):")
+        print("  python viewer.py --bake [--fps 30] [--out bake] [--workers N] <model.m2> ...")
         sys.exit(1)
 
-    m2_path = sys.argv[1]
+    m2_path = args[0]
 
     print(f"Loading {m2_path}...")
     m2 = load_m2(m2_path)
 
-    gv_tris = defaultdict(int)
+    # Built once here for the listing and handed to the viewer
+    geoset_faces = build_geoset_faces(m2)
+    gv_tris = geoset_faces[1]
     tri = m2.skin.tri_indices
-    for sm in m2.skin.submeshes:
-        gv_tris[(sm.group, sm.variant)] += sm.index_count // 3
 
     groups = sorted(set(k[0] for k in gv_tris))
     print(f"  {len(m2.vertices)} vertices, {len(tri)//3} triangles")
@@ -2110,9 +3515,132 @@ def main():
         print("  No textures found")
     print()
 
-    viewer = M2Viewer(m2, texture_paths=texture_paths)
+    viewer = M2Viewer(m2, texture_paths=texture_paths, compact_meshes=compact,
+                      geoset_faces=geoset_faces)
     viewer.run()
 
 
+# ---------------------------------------------------------------------------
+# Headless animation bake
+# ---------------------------------------------------------------------------
+
+BAKE_CHUNK_FRAMES = 64  # frames evaluated per batched pose call
+
+
+def _bake_animations(m2_path, anim_indices, fps, out_dir):
+    """Worker: bake the given animations of one M2 into .npy files.
+
+    Frames are sampled at `fps` from 0 up to each animation's duration and
+    streamed into memory-mapped arrays per animation:
+      anim_NNN_positions.npy  (F, N, 3) float32 deformed vertex positions
+      anim_NNN_bones.npy      (F, B, 3, 4) float32 bone world matrices
+    Returns the total number of frames written.
+    """
+    m2 = load_m2(m2_path)
+    pose = BonePoseEvaluator(m2.bones)
+    engine = SkinningEngine.from_m2(m2)
+    n_verts, n_bones = len(m2.vertices), len(m2.bones)
+    out_dir = Path(out_dir)
+    total = 0
+    for ai in anim_indices:
+        duration = m2.animations[ai].duration
+        times = np.arange(0, max(duration, 1), 1000.0 / fps)
+        positions = np.lib.format.open_memmap(
+            out_dir / f"anim_{ai:03d}_positions.npy", mode='w+',
+            dtype=np.float32, shape=(len(times), n_verts, 3))
+        bones = np.lib.format.open_memmap(
+            out_dir / f"anim_{ai:03d}_bones.npy", mode='w+',
+            dtype=np.float32, shape=(len(times), n_bones, 3, 4))
+        for c0 in range(0, len(times), BAKE_CHUNK_FRAMES):
+            chunk = times[c0:c0 + BAKE_CHUNK_FRAMES]
+            world = pose.evaluate(ai, chunk)
+            bones[c0:c0 + len(chunk)] = world[:, :, :3, :]
+            for f in range(len(chunk)):
+                positions[c0 + f] = engine.deform(world[f])
+        positions.flush()
+        bones.flush()
+        del positions, bones
+        total += len(times)
+    return total
+
+
+def _bake_dirs(out, m2_paths):
+    """Output directory per model, named by file stem.
+
+    Models sharing a stem (same file name in different folders) get _2,
+    _3, ... suffixes so their bakes don't overwrite each other.
+    """
+    used = set()
+    dirs = []
+    for m2_path in m2_paths:
+        stem = name = Path(m2_path).stem
+        n = 1
+        while name in used:
+            n += 1
+            name = f"{stem}_{n}"
+        used.add(name)
+        dirs.append(Path(out) / name)
+    return dirs
+
+
+def bake_main(argv=None):
+    """Bake every animation of each given M2 without opening a window.
+
+    Animations are spread across a process pool. Per model, an index.npz
+    records the animation names, durations, frame counts and frame rate
+    next to the per-animation .npy files (see _bake_animations).
+    """
+    parser = argparse.ArgumentParser(
+        prog="viewer.py --bake",
+        description="Bake per-frame deformed positions and bone matrices "
+                    "for every animation of one or more M2 models.")
+    parser.add_argument("m2", nargs="+", help="M2 model file(s)")
+    parser.add_argument("--fps", type=float, default=30.0,
+                        help="sampling rate (default: 30)")
+    parser.add_argument("--out", default="bake",
+                        help="output directory (default: ./bake)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for m2_path, model_dir in zip(args.m2, _bake_dirs(args.out, args.m2)):
+            m2 = load_m2(m2_path)
+            model_dir.mkdir(parents=True, exist_ok=True)
+            n_anims = len(m2.animations)
+            print(f"Baking {m2_path}: {n_anims} animations, "
+                  f"{len(m2.vertices)} vertices, {len(m2.bones)} bones")
+
+            start = time.perf_counter()
+            # Interleave so long and short clips spread across workers
+            n_jobs = min(args.workers, n_anims)
+            jobs = [pool.submit(_bake_animations, str(m2_path),
+                                list(range(j, n_anims, n_jobs)),
+                                args.fps, str(model_dir))
+                    for j in range(n_jobs)]
+            n_frames = sum(job.result() for job in jobs)
+            elapsed = time.perf_counter() - start
+
+            durations = np.array([a.duration for a in m2.animations], dtype=np.int64)
+            np.savez(
+                model_dir / "index.npz",
+                names=np.array([str(a.name) for a in m2.animations]),
+                durations=durations,
+                n_frames=np.array([len(np.arange(0, max(d, 1), 1000.0 / args.fps))
+                                   for d in durations], dtype=np.int64),
+                fps=np.float64(args.fps),
+            )
+            rate = n_frames / elapsed if elapsed > 0 else float('inf')
+            print(f"  {n_frames} frames in {elapsed:.2f}s ({rate:.1f} frames/s) "
+                  f"-> {model_dir}")
+
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == '--bake':
+        bake_main(sys.argv[2:])
+    else:
+        main()